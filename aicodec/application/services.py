@@ -1,14 +1,27 @@
 # aicodec/application/services.py
 import hashlib
 import json
+import time
 from pathlib import Path
 
 import tiktoken
 
-from ..domain.models import AggregateConfig, Change
+from ..domain.models import AggregateConfig, Change, FileItem
 from ..domain.repositories import IChangeSetRepository, IFileRepository
 
 
+def _file_item_to_json(obj: object) -> dict[str, str | None]:
+    """Serializes a FileItem lazily while encoding, so no intermediate dict list is built."""
+    if isinstance(obj, FileItem):
+        return {'filePath': obj.file_path, 'content': obj.content}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_CONTEXT_ENCODER = json.JSONEncoder(indent=2, default=_file_item_to_json)
+# Stored alongside the per-file signatures; an empty string is never a relative file path
+_SIGNATURES_TAKEN_AT_KEY = ''
+
+
 class AggregationService:
     """Orchestrates the file aggregation use case."""
 
@@ -19,43 +32,68 @@ class AggregationService:
         self.output_dir = self.project_root / '.aicodec'
         self.output_file = self.output_dir / 'context.json'
         self.hashes_file = self.output_dir / 'hashes.json'
+        self.signatures_file = self.output_dir / 'signatures.json'
 
     def aggregate(self, full_run: bool = False, count_tokens: bool = False) -> None:
         """Main execution method to aggregate files."""
+        run_started_ns = time.time_ns()
         previous_hashes = {} if full_run else self.file_repo.load_hashes(
             self.hashes_file)
-        discovered_files = self.file_repo.discover_files(self.config)
+        previous_signatures = {} if full_run else self.file_repo.load_hashes(
+            self.signatures_file)
+        # Without a record of when the signatures were taken, none of them can be trusted
+        taken_at = previous_signatures.pop(_SIGNATURES_TAKEN_AT_KEY, '')
+        trusted_before_ns = int(taken_at) if taken_at.isdigit() else 0
+        # Only trust a signature if we still know the hash it belongs to
+        known_signatures = {
+            path: sig for path, sig in previous_signatures.items() if path in previous_hashes}
+        discovered_files = self.file_repo.discover_files(self.config, known_signatures, trusted_before_ns)
 
         if not discovered_files:
             print("No files found to aggregate based on the current configuration.")
             return
 
         current_hashes: dict[str, str] = {}
-        aggregated_content: list[dict[str, str]] = []
+        current_signatures: dict[str, str] = {_SIGNATURES_TAKEN_AT_KEY: str(run_started_ns)}
+        aggregated_content: list[FileItem] = []
+        # On a full run (or the first run) every file is new, so skip the per-file comparison entirely
+        compare_hashes = bool(previous_hashes)
+        get_previous_hash = previous_hashes.get
 
         for file_item in discovered_files:
             relative_path = file_item.file_path
             content = file_item.content
+            if file_item.signature is not None:
+                current_signatures[relative_path] = file_item.signature
+            if content is None:
+                # Unchanged on disk since the last run, so the stored hash still applies
+                current_hashes[relative_path] = previous_hashes[relative_path]
+                continue
             file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
             current_hashes[relative_path] = file_hash
 
-            if previous_hashes.get(relative_path) != file_hash:
-                aggregated_content.append({
-                    'filePath': relative_path,
-                    'content': content
-                })
+            if not compare_hashes or get_previous_hash(relative_path) != file_hash:
+                aggregated_content.append(file_item)
 
         if not aggregated_content:
             print("No changes detected in the specified files since last run.")
             self.file_repo.save_hashes(self.hashes_file, {**previous_hashes, **current_hashes})
+            self.file_repo.save_hashes(self.signatures_file, current_signatures)
             return
 
         self.output_dir.mkdir(exist_ok=True)
-        json_output = json.dumps(aggregated_content, indent=2)
+        json_output = ""
         with open(self.output_file, 'w', encoding='utf-8') as f:
-            f.write(json_output)
+            if count_tokens:
+                # The tokenizer needs the whole document in memory anyway
+                json_output = _CONTEXT_ENCODER.encode(aggregated_content)
+                f.write(json_output)
+            else:
+                # Stream chunks to disk as they are encoded instead of building one large string first
+                f.writelines(_CONTEXT_ENCODER.iterencode(aggregated_content))
 
         self.file_repo.save_hashes(self.hashes_file, {**previous_hashes, **current_hashes})
+        self.file_repo.save_hashes(self.signatures_file, current_signatures)
 
         token_count_msg = ""
         if count_tokens:
@@ -119,12 +157,9 @@ class ReviewService:
             if action == 'CREATE':  # If file exists, it's a replace
                 action = 'REPLACE'
             if action == 'REPLACE':
-                # Don't include if content is identical
-                hash_disk = hashlib.sha256(
-                    original_content.encode('utf-8')).hexdigest()
-                hash_proposed = hashlib.sha256(
-                    change.content.encode('utf-8')).hexdigest()
-                if hash_disk == hash_proposed:
+                # Don't include if content is identical. A direct comparison needs no
+                # encoding or hasher objects and stops at the first differing character.
+                if original_content == change.content:
                     return None, False
             return action, True
         else:  # File does not exist
@@ -10,11 +10,12 @@ class ChangeAction(Enum):
     DELETE = "DELETE"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileItem:
     """Represents a file in the codebase with its content."""
     file_path: str  # Relative path
-    content: str
+    content: str | None  # None if the file is unchanged since its signature was recorded
+    signature: str | None = None  # "<ino>:<ctime_ns>:<mtime_ns>:<size>" of the file on disk, if known
 
 
 @dataclass
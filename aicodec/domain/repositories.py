@@ -9,8 +9,13 @@ class IFileRepository(ABC):
     """Interface for file discovery and content retrieval."""
 
     @abstractmethod
-    def discover_files(self, config: AggregateConfig) -> list[FileItem]:
-        """Discovers all files to be included based on the configuration."""
+    def discover_files(
+        self, config: AggregateConfig, known_signatures: dict[str, str] | None = None, trusted_before_ns: int = 0
+    ) -> list[FileItem]:
+        """Discovers all files to be included, skipping reads of files whose signature is unchanged.
+
+        Signatures are only trusted for files last modified before `trusted_before_ns`, the time they were taken.
+        """
         pass  # pragma: no cover
 
     @abstractmethod
@@ -1,10 +1,12 @@
 # aicodec/infrastructure/cli/command_line_interface.py
 import argparse
+import logging
 import sys
 from pathlib import Path
 
 from aicodec import __version__
 
+from ..utils import start_logging
 from .commands import (
     aggregate,
     apply,
@@ -66,7 +68,12 @@ def main() -> None:  # pragma: no cover
         check_config_exists(args.config)
 
     # Call the function associated with the command
-    args.func(args)
+    listener = start_logging(logging.INFO)
+    try:
+        args.func(args)
+    finally:
+        if listener is not None:
+            listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 # aicodec/infrastructure/cli/commands/prompt.py
 import shutil
 import sys
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
 from typing import Any
@@ -104,19 +105,29 @@ def register_subparser(subparsers: Any) -> None:
     prompt_parser.set_defaults(func=run)
 
 
-def _run_output_guide(args: Any, prompt_cfg: dict) -> None:
-    """Output only the LLM formatting rules and schema (without code context or task)."""
-    schema_path = files("aicodec") / "assets" / "decoder_schema.json"
-    schema_content = parse_json_file(schema_path)
+@lru_cache(maxsize=1)
+def _prompt_template_env() -> jinja2.Environment:
+    """The Jinja environment for the packaged prompt templates.
 
+    Shared per process so each template file is read and compiled once; Jinja reloads it if the file changes.
+    """
     prompt_templates_path = files("aicodec") / "assets" / "prompts"
-    env = jinja2.Environment(
+    return jinja2.Environment(
         loader=jinja2.FileSystemLoader(str(prompt_templates_path)),
+        # B701:autoescape is False. This is safe as we are generating plain text files, not HTML.
         autoescape=False,  # nosec B701
         trim_blocks=True,
         lstrip_blocks=True
     )
 
+
+def _run_output_guide(args: Any, prompt_cfg: dict) -> None:
+    """Output only the LLM formatting rules and schema (without code context or task)."""
+    schema_path = files("aicodec") / "assets" / "decoder_schema.json"
+    schema_content = parse_json_file(schema_path)
+
+    env = _prompt_template_env()
+
     # Determine which guide template to use (minimal or full)
     minimal_guide = args.minimal or prompt_cfg.get("minimal", False)
     template_name = "output_guide_minimal.j2" if minimal_guide else "output_guide_full.j2"
@@ -173,15 +184,6 @@ def run(args: Any) -> None:
         _run_output_guide(args, prompt_cfg)
         return
 
-    # Clear reverts folder to start a new session
-    reverts_dir = Path(".aicodec") / "reverts"
-    if reverts_dir.exists() and reverts_dir.is_dir():
-        revert_files = list(reverts_dir.glob('revert-*.json'))
-        if revert_files:
-            print(f"Starting new session. Clearing {len(revert_files)} old revert file(s)...")
-            shutil.rmtree(reverts_dir)
-            print("Reverts cleared.")
-
     if args.exclude_code or args.is_new_project:
         include_code_context = False
     else:
@@ -215,6 +217,15 @@ def run(args: Any) -> None:
         )
         sys.exit(1)
 
+    # Clear reverts folder to start a new session, only once we know a prompt can be built
+    reverts_dir = Path(".aicodec") / "reverts"
+    if reverts_dir.exists() and reverts_dir.is_dir():
+        revert_files = list(reverts_dir.glob('revert-*.json'))
+        if revert_files:
+            print(f"Starting new session. Clearing {len(revert_files)} old revert file(s)...")
+            shutil.rmtree(reverts_dir)
+            print("Reverts cleared.")
+
     schema_path = files("aicodec") / "assets" / "decoder_schema.json"
     schema_content = parse_json_file(schema_path)
 
@@ -230,14 +241,7 @@ def run(args: Any) -> None:
     else:
         task = prompt_cfg.get("task", args.task)
 
-    prompt_templates_path = files("aicodec") / "assets" / "prompts"
-    env = jinja2.Environment(
-        loader=jinja2.FileSystemLoader(str(prompt_templates_path)),
-        # B701:autoescape is False. This is safe as we are generating plain text files, not HTML.
-        autoescape=False,  # nosec B701
-        trim_blocks=True,
-        lstrip_blocks=True
-    )
+    env = _prompt_template_env()
 
     custom_template_str = prompt_cfg.get("template")
 
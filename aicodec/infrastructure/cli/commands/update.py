@@ -1,11 +1,15 @@
 # aicodec/infrastructure/cli/commands/update.py
+import io
 import json
 import os
 import platform
 import shutil
+import stat
 import subprocess
 import sys
+import time
 import urllib.request
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -25,18 +29,61 @@ def register_subparser(subparsers: Any) -> None:
     update_parser.set_defaults(func=run)
 
 
-def get_latest_version() -> str | None:
-    """Fetch the latest version from GitHub releases."""
+LATEST_RELEASE_URL = "https://api.github.com/repos/Stevie1704/aicodec/releases/latest"
+# How long a fetched release tag is trusted before GitHub is asked again
+LATEST_VERSION_TTL_SECONDS = 600
+
+
+def _latest_version_cache_file() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "aicodec" / "latest_version.json"
+
+
+def _read_cached_latest_version() -> str | None:
+    """Return the cached release tag if it was fetched from this URL within the TTL."""
     try:
-        url = "https://api.github.com/repos/Stevie1704/aicodec/releases/latest"
-        with urllib.request.urlopen(url, timeout=10) as response:  # nosec B310 - GitHub API HTTPS only
-            data = json.loads(response.read().decode())
-            tag_name = data.get("tag_name", "")
-            # Remove 'v' prefix if present
-            return tag_name.lstrip("v")
-    except Exception as e:
-        print(f"Error fetching latest version: {e}", file=sys.stderr)
-        return None
+        cached = json.loads(_latest_version_cache_file().read_bytes())
+        tag = cached.get("tag_name")
+        # A negative age means a skewed clock or an edited file, so it is not trusted either
+        age = time.time() - cached["fetched_at"]
+        if isinstance(tag, str) and tag and cached["url"] == LATEST_RELEASE_URL and 0 <= age < LATEST_VERSION_TTL_SECONDS:
+            return tag
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _write_cached_latest_version(tag_name: str) -> None:
+    # The cache is only an optimization, so failing to write it must never break the update check
+    try:
+        cache_file = _latest_version_cache_file()
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({"url": LATEST_RELEASE_URL, "fetched_at": time.time(), "tag_name": tag_name}))
+    except OSError:
+        pass
+
+
+def get_latest_version() -> str | None:
+    """Fetch the latest version from GitHub releases, reusing a recent answer from the user cache."""
+    tag_name = _read_cached_latest_version()
+    if tag_name is None:
+        try:
+            with urllib.request.urlopen(LATEST_RELEASE_URL, timeout=10) as response:  # nosec B310 - GitHub API HTTPS only
+                data = json.loads(response.read().decode())
+                tag_name = data.get("tag_name", "")
+        except Exception as e:
+            print(f"Error fetching latest version: {e}", file=sys.stderr)
+            return None
+        if tag_name:
+            _write_cached_latest_version(tag_name)
+    # Remove 'v' prefix if present
+    return tag_name.lstrip("v")
+
+
+@lru_cache(maxsize=256)
+def _parse_version(v: str) -> tuple:
+    """Split a dotted version string into a tuple of ints. Raises ValueError (never cached) on bad input."""
+    return tuple(int(x) for x in v.split("."))
 
 
 def compare_versions(current: str, latest: str) -> int:
@@ -44,12 +91,9 @@ def compare_versions(current: str, latest: str) -> int:
     Compare two version strings.
     Returns: -1 if current < latest, 0 if equal, 1 if current > latest
     """
-    def parse_version(v: str) -> tuple:
-        return tuple(int(x) for x in v.split("."))
-
     try:
-        current_parts = parse_version(current)
-        latest_parts = parse_version(latest)
+        current_parts = _parse_version(current)
+        latest_parts = _parse_version(latest)
 
         if current_parts < latest_parts:
             return -1
@@ -87,6 +131,18 @@ def can_write_to_path(path: Path) -> bool:
         return False
 
 
+def _default_binary_path() -> Path:
+    """Where the install scripts put the pre-built binary on this platform."""
+    if platform.system().lower() == "windows":
+        # Windows installation is in user profile directory
+        return Path.home() / "aicodec" / "aicodec.exe"
+    # Linux/macOS installation is in /opt/aicodec
+    return Path("/opt/aicodec") / "aicodec"
+
+
+# The running binary and its install location cannot change while aicodec runs, so these probes
+# (PATH lookups and stat calls) are answered once per process; tests reset them with cache_clear()
+@lru_cache(maxsize=1)
 def get_running_binary_path() -> tuple[Path | None, Path | None]:
     """Find the actual path of the currently running aicodec binary.
 
@@ -104,25 +160,25 @@ def get_running_binary_path() -> tuple[Path | None, Path | None]:
     aicodec_in_path = shutil.which(binary_name)
     if aicodec_in_path:
         path_in_path = Path(aicodec_in_path)
-        # Resolve symlinks to get the real path
+        # Resolve symlinks to get the real path, then stat it once for both "exists" and "is a file"
         real_path = path_in_path.resolve()
-        if real_path.exists() and real_path.is_file():
+        try:
+            is_file = stat.S_ISREG(real_path.stat().st_mode)
+        except OSError:
+            is_file = False
+        if is_file:
             # Check if it's a symlink
             symlink_path = path_in_path if path_in_path.is_symlink() else None
             return real_path, symlink_path
 
-    # Fallback: Check default installation locations
-    if os_name == "windows":
-        default_path = Path.home() / "aicodec" / binary_name
-    else:
-        default_path = Path("/opt/aicodec") / binary_name
-
-    if default_path.exists():
-        return default_path.resolve(), None
-
-    return None, None
+    # Fallback: Check default installation locations (a strict resolve fails if it is missing)
+    try:
+        return _default_binary_path().resolve(strict=True), None
+    except OSError:
+        return None, None
 
 
+@lru_cache(maxsize=1)
 def is_frozen_binary() -> bool:
     """Check if we're running from a frozen/compiled binary (PyInstaller, Nuitka, etc.).
 
@@ -145,6 +201,7 @@ def is_frozen_binary() -> bool:
     return False
 
 
+@lru_cache(maxsize=1)
 def is_prebuilt_install() -> bool:
     """Check if we're running from a pre-built binary installation.
 
@@ -157,18 +214,17 @@ def is_prebuilt_install() -> bool:
         return False
 
     # Then verify the binary exists in the expected location
-    os_name = platform.system().lower()
+    return _default_binary_path().exists()
 
-    if os_name == "windows":
-        # Windows installation is in user profile directory
-        install_dir = Path.home() / "aicodec"
-        binary_name = "aicodec.exe"
-    else:
-        # Linux/macOS installation is in /opt/aicodec
-        install_dir = Path("/opt/aicodec")
-        binary_name = "aicodec"
 
-    return install_dir.exists() and (install_dir / binary_name).exists()
+_RELEASE_OS_NAMES = ("darwin", "linux", "windows")
+# platform.machine() spellings for each architecture a release is built for
+_RELEASE_ARCHES = {"x86_64": "amd64", "amd64": "amd64", "aarch64": "arm64", "arm64": "arm64"}
+_DOWNLOAD_URLS = {
+    (os_name, arch): f"https://github.com/Stevie1704/aicodec/releases/latest/download/aicodec-{os_name}-{arch}.zip"
+    for os_name in _RELEASE_OS_NAMES
+    for arch in set(_RELEASE_ARCHES.values())
+}
 
 
 def get_download_url() -> str | None:
@@ -176,27 +232,16 @@ def get_download_url() -> str | None:
     os_name = platform.system().lower()
     machine = platform.machine().lower()
 
-    # Map platform names
-    if os_name == "darwin":
-        os_name = "darwin"
-    elif os_name == "linux":
-        os_name = "linux"
-    elif os_name == "windows":
-        os_name = "windows"
-    else:
+    if os_name not in _RELEASE_OS_NAMES:
         print(f"Unsupported OS: {os_name}", file=sys.stderr)
         return None
 
-    # Map architecture names
-    if machine in ("x86_64", "amd64"):
-        arch = "amd64"
-    elif machine in ("aarch64", "arm64"):
-        arch = "arm64"
-    else:
+    arch = _RELEASE_ARCHES.get(machine)
+    if arch is None:
         print(f"Unsupported architecture: {machine}", file=sys.stderr)
         return None
 
-    return f"https://github.com/Stevie1704/aicodec/releases/latest/download/aicodec-{os_name}-{arch}.zip"
+    return _DOWNLOAD_URLS[os_name, arch]
 
 
 def create_update_script(new_binary_path: Path, target_binary: Path, needs_sudo: bool, sudo_available: bool) -> Path:
@@ -294,11 +339,10 @@ if [ $attempt -eq $max_attempts ]; then
     echo "WARNING: Timed out waiting for aicodec to exit" >> "$LOG_FILE"
 fi
 
-# Replace the binary using sudo
+# Replace the binary using a single sudo invocation (one privileged process, at most one password prompt)
 echo "Attempting to move from {new_binary_path} to {target_binary}" >> "$LOG_FILE"
-sudo mv "{new_binary_path}" "{target_binary}" 2>> "$LOG_FILE"
+sudo sh -c 'mv "$1" "$2" && chmod +x "$2"' sh "{new_binary_path}" "{target_binary}" 2>> "$LOG_FILE"
 if [ $? -eq 0 ]; then
-    sudo chmod +x "{target_binary}" 2>> "$LOG_FILE"
     echo "✅ Update installed successfully!" | tee -a "$LOG_FILE"
     echo "You can now run 'aicodec --version' to verify the update."
     echo "Log file: {log_path}"
@@ -428,19 +472,19 @@ def update_binary() -> bool:
                 print("   Please contact your system administrator or reinstall aicodec in a user-writable location.", file=sys.stderr)
                 return False
 
-    # Download to install directory with temporary name
+    # Extract the binary into the install directory with a temporary name
     new_binary_path = install_dir / new_binary_name
-    zip_file = install_dir / "aicodec.zip.tmp"
 
     try:
-        # Download
+        # Download the release archive into memory; it is small, and this avoids a temporary zip on disk
         print(f"Downloading from: {download_url}")
-        urllib.request.urlretrieve(download_url, zip_file)  # nosec B310 - GitHub releases HTTPS only
+        with urllib.request.urlopen(download_url) as response:  # nosec B310 - GitHub releases HTTPS only
+            archive = io.BytesIO(response.read())
 
         # Unzip
         print("Extracting...")
         import zipfile
-        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+        with zipfile.ZipFile(archive, 'r') as zip_ref:
             # List contents for debugging
             members = zip_ref.namelist()
             print(f"Zip contains: {members}")
@@ -470,9 +514,6 @@ def update_binary() -> bool:
                         target.write(source.read())
                 print(f"  Extracted: {base_name}")
 
-        # Clean up zip file
-        zip_file.unlink()
-
         if not binary_found or not new_binary_path.exists():
             print(f"Error: Could not find {binary_name} binary in downloaded package", file=sys.stderr)
             return False
@@ -512,7 +553,6 @@ def update_binary() -> bool:
         print(f"   Check the log file for details: {log_path}")
         print("   Exiting in 2 seconds...")
 
-        import time
         time.sleep(2)
 
         return True
@@ -520,8 +560,6 @@ def update_binary() -> bool:
     except Exception as e:
         print(f"Error during update: {e}", file=sys.stderr)
         # Clean up on error
-        if zip_file.exists():
-            zip_file.unlink()
         if new_binary_path.exists():
             new_binary_path.unlink()
         return False
@@ -2,16 +2,19 @@
 import json
 import re
 import sys
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
-
-from jsonschema import ValidationError, validate
+from typing import Any
 
 
 class JsonPreparationError(Exception):
     pass
 
 
+_CONFIRMATION_ANSWERS = {"y": True, "yes": True, "n": False, "no": False}
+
+
 def get_user_confirmation(prompt: str, default_yes: bool = True) -> bool:
     """Generic function to get a yes/no confirmation from the user."""
     options = "[Y/n]" if default_yes else "[y/N]"
@@ -19,10 +22,9 @@ def get_user_confirmation(prompt: str, default_yes: bool = True) -> bool:
         response = input(f"{prompt} {options} ").lower().strip()
         if not response:
             return default_yes
-        if response in ["y", "yes"]:
-            return True
-        if response in ["n", "no"]:
-            return False
+        answer = _CONFIRMATION_ANSWERS.get(response)
+        if answer is not None:
+            return answer
         print("Invalid input. Please enter 'y' or 'n'.")
 
 
@@ -38,8 +40,7 @@ def get_list_from_user(prompt: str) -> list[str]:
 def parse_json_file(file_path: Path) -> str:
     """Reads and returns the content of a JSON file as a formatted string."""
     try:
-        content = file_path.read_text(encoding="utf-8")
-        return json.dumps(json.loads(content), separators=(',', ':'))
+        return json.dumps(json.loads(file_path.read_bytes()), separators=(',', ':'))
     except FileNotFoundError:
         print(f"Error: JSON file '{file_path}' not found.", file=sys.stderr)
         sys.exit(1)
@@ -49,6 +50,10 @@ def parse_json_file(file_path: Path) -> str:
         sys.exit(1)
 
 
+# Matches ```json or ``` followed by content, optionally closed with ```
+MARKDOWN_CODE_BLOCK_PATTERN = re.compile(r'```(?:json)?\s*\n?(.*?)(?:```|$)', re.DOTALL)
+
+
 def extract_json_from_text(text: str) -> str:
     """
     Extracts JSON content from text that may be wrapped in markdown code blocks.
@@ -61,12 +66,7 @@ def extract_json_from_text(text: str) -> str:
     Returns the extracted JSON string, or the original text if no JSON found.
     """
     # Try to extract from markdown code block first
-    # Pattern matches ```json or ``` followed by content, optionally closed with ```
-    markdown_pattern = re.compile(
-        r'```(?:json)?\s*\n?(.*?)(?:```|$)',
-        re.DOTALL
-    )
-    match = markdown_pattern.search(text)
+    match = MARKDOWN_CODE_BLOCK_PATTERN.search(text)
     if match:
         extracted = match.group(1).strip()
         if extracted and (extracted.startswith('{') or extracted.startswith('[')):
@@ -135,6 +135,20 @@ def balance_json_structure(json_str: str) -> str:
     return json_str
 
 
+@lru_cache(maxsize=1)
+def _decoder_schema_validator() -> Any:
+    """Loads the packaged change-set schema, checks it and builds its validator once per process.
+
+    jsonschema is slow to import and only needed here, so it stays off the CLI startup path.
+    """
+    from jsonschema.validators import validator_for
+
+    schema = json.loads((files("aicodec") / "assets" / "decoder_schema.json").read_bytes())
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
 def clean_prepare_json_string(llm_json: str) -> str:
     """
     Cleans and validates a JSON string generated by an LLM for the prepare command.
@@ -145,9 +159,7 @@ def clean_prepare_json_string(llm_json: str) -> str:
       4. Validate against schema.
     """
     try:
-        schema_path = files("aicodec") / "assets" / "decoder_schema.json"
-        schema_content = schema_path.read_text(encoding="utf-8")
-        schema = json.loads(schema_content)
+        validator = _decoder_schema_validator()
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error: Could not load the internal JSON schema. {e}")
         # Return empty JSON object as fallback to prevent crash, or raise
@@ -183,15 +195,21 @@ def clean_prepare_json_string(llm_json: str) -> str:
                 f"Context (last 100 chars): ...{final_attempt_str[-100:]}"
             ) from e
 
-    try:
-        validate(instance=cleaned_json, schema=schema)
-    except ValidationError as e:
+    from jsonschema.exceptions import best_match
+
+    # Report the most relevant error, as jsonschema.validate does
+    error = best_match(validator.iter_errors(cleaned_json))
+    if error is not None:
         raise JsonPreparationError(
-            f"Error: JSON validation failed. {e}") from e
+            f"Error: JSON validation failed. {error}") from error
 
     return json.dumps(cleaned_json, indent=4)
 
 
+# ASCII control characters except \t, \n and \r (ranges: 0-8, 11-12, 14-31, and 127)
+JSON_CONTROL_CHARS_PATTERN = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+
 def clean_json_string(s: str) -> str:
     """
     Cleans a string intended for JSON parsing.
@@ -203,15 +221,13 @@ def clean_json_string(s: str) -> str:
     """
 
     # 1. Replace the actual non-breaking space character with a regular space
-    s = re.sub(r'\xa0', ' ', s)
+    s = s.replace('\xa0', ' ')
 
     # 2. Replace the literal text sequence "\\u00a0" with a regular space
-    # (The first \ escapes the second \ for the regex)
-    s = re.sub(r'\\u00a0', ' ', s)
+    s = s.replace('\\u00a0', ' ')
 
     # 3. Remove other control characters, preserving \t, \n, \r
-    #    (Ranges: 0-8, 11-12, 14-31, and 127)
-    s = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', s)
+    s = JSON_CONTROL_CHARS_PATTERN.sub('', s)
 
     return s
 
@@ -221,17 +237,17 @@ def clean_json_string(s: str) -> str:
 # Fixes stray backslashes: finds 1+ slashes followed by a "non-escape" char
 JSON_STRAY_BACKSLASH_PATTERN = re.compile(r'(\\+)(?:([^"\\/bfnrtu])|$)')
 
+# A double-quote not preceded by a backslash
+JSON_UNESCAPED_QUOTE_PATTERN = re.compile(r'(?<!\\)"')
+
 # Finds "summary" or "content" string values in the JSON.
 # This is more robust: it captures ("key": ")(...content...)(" , or })
 # It correctly captures the start/end quotes as groups 1 and 3.
 TARGET_FIELD_PATTERN_TEMPLATE = r'("{field_name}":\s*")(.*?)("\s*(?:,|}}))'
 
-JSON_SUMMARY_PATTERN = re.compile(
-    TARGET_FIELD_PATTERN_TEMPLATE.format(field_name="summary"),
-    re.DOTALL
-)
-JSON_CONTENT_PATTERN = re.compile(
-    TARGET_FIELD_PATTERN_TEMPLATE.format(field_name="content"),
+# Both fields are matched by one alternation, so the text is scanned once rather than once per field
+JSON_STRING_FIELDS_PATTERN = re.compile(
+    TARGET_FIELD_PATTERN_TEMPLATE.format(field_name="(?:summary|content)"),
     re.DOTALL
 )
 
@@ -255,14 +271,15 @@ MARKDOWN_ESCAPES = {
     r'\|': '|',
 }
 
+# One alternation over every escaped character, so the text is scanned once instead of once per escape
+MARKDOWN_ESCAPE_PATTERN = re.compile(r'\\([' + re.escape(''.join(MARKDOWN_ESCAPES.values())) + r'])')
+
 # --- 3. Helper Functions for Clean Code ---
 
 
 def _fix_global_markdown_escapes(text: str) -> str:
     r"""Fixes all Markdown "over-escaping" (e.g., \_ -> _) globally."""
-    for escaped, unescaped in MARKDOWN_ESCAPES.items():
-        text = text.replace(escaped, unescaped)
-    return text
+    return MARKDOWN_ESCAPE_PATTERN.sub(r'\1', text)
 
 
 def _backslash_replacer(match: re.Match[str]) -> str:
@@ -308,14 +325,14 @@ def _fix_json_string_content(content: str) -> str:
     # STEP (C): Fix unescaped double-quotes.
     # This logic is correct, as it only escapes a " if it's
     # NOT already preceded by a (single) backslash.
-    fixed_content = re.sub(r'(?<!\\)"', r'\"', fixed_content)
+    fixed_content = JSON_UNESCAPED_QUOTE_PATTERN.sub(r'\"', fixed_content)
 
     return fixed_content
 
 
 def _json_string_value_replacer(match: re.Match[str]) -> str:
     """
-    The main re.sub replacer function for summary_regex and content_regex.
+    The main re.sub replacer function for JSON_STRING_FIELDS_PATTERN.
     It extracts the content, fixes it, and reassembles the string.
     """
     pre: str = match.group(1)   # ("summary": "
@@ -337,6 +354,13 @@ def fix_and_parse_ai_json(text: str) -> str | None:
     2. Fixes JSON "under-escaping" (e.g., unescaped ", \, newlines)
        only within the "summary" and "content" string values.
     """
+    try:
+        # Valid JSON needs no fixing, so it skips every pass below
+        json.loads(text)
+        return text
+    except json.JSONDecodeError:
+        pass
+
     try:
         # 1. Fix all Markdown "over-escaping" globally.
         text = _fix_global_markdown_escapes(text)
@@ -348,8 +372,7 @@ def fix_and_parse_ai_json(text: str) -> str | None:
             pass  # Still invalid, proceed with targeted fixes
 
         # 2. Run the targeted replacements
-        text = JSON_SUMMARY_PATTERN.sub(_json_string_value_replacer, text)
-        text = JSON_CONTENT_PATTERN.sub(_json_string_value_replacer, text)
+        text = JSON_STRING_FIELDS_PATTERN.sub(_json_string_value_replacer, text)
 
     except Exception as e:
         # Log the error if you have a logger
@@ -1,5 +1,6 @@
 # aicodec/infrastructure/repositories/file_system_repository.py
 import json
+import logging
 import os
 import shlex
 import subprocess
@@ -11,11 +12,29 @@ import pathspec
 from ...domain.models import AggregateConfig, Change, ChangeAction, ChangeSet, FileItem
 from ...domain.repositories import IChangeSetRepository, IFileRepository
 
+logger = logging.getLogger(__name__)
+
+_DROP_CACHE_THRESHOLD = 16 * 1024 * 1024
+# FAT stores mtimes in 2 s steps and most kernels stamp files from a coarse clock, so allow for both
+_TIMESTAMP_SLACK_NS = 2_000_000_000
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    """Passes an access pattern hint to the kernel where supported. Hints are advisory, so failures are ignored."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
 
 class FileSystemFileRepository(IFileRepository):
     """Manages file discovery and hashing on the local filesystem."""
 
-    def discover_files(self, config: AggregateConfig) -> list[FileItem]:
+    def discover_files(
+        self, config: AggregateConfig, known_signatures: dict[str, str] | None = None, trusted_before_ns: int = 0
+    ) -> list[FileItem]:
+        known_signatures = known_signatures or {}
         discovered_paths = self._discover_paths(config)
         plugin_map = {
             ext: cmd for plugin in config.plugins for ext, cmd in plugin.items()
@@ -29,6 +48,7 @@ class FileSystemFileRepository(IFileRepository):
 
             try:
                 content = None
+                signature = None
                 # Check if a plugin is configured for this file extension
                 if file_ext and file_ext in plugin_map:
                     command_template = plugin_map[file_ext]
@@ -51,39 +71,65 @@ class FileSystemFileRepository(IFileRepository):
                         # The content is simply the raw output of the plugin
                         content = result.stdout.strip()
                     except subprocess.CalledProcessError as e:
-                        print(
-                            f"Warning: Plugin for {file_ext} failed on {relative_path}: {e.stderr}")
+                        logger.warning("Plugin for %s failed on %s: %s", file_ext, relative_path, e.stderr)
                         continue
                     except FileNotFoundError as e:
-                        print(f"Warning: Command not found for plugin {file_ext}: {e}")
+                        logger.warning("Command not found for plugin %s: %s", file_ext, e)
                         continue
 
                 # If no plugin was run, fall back to reading as a text file
                 else:
-                    # Simple binary file check
-                    with open(file_path, 'rb') as f:
-                        if b'\0' in f.read(1024):
-                            print(f"Skipping binary file: {relative_path}")
-                            continue
+                    # Files whose stat signature matches the previous run are not read again
+                    stat = file_path.stat()
+                    signature = f"{stat.st_ino}:{stat.st_ctime_ns}:{stat.st_mtime_ns}:{stat.st_size}"
+                    # git's racy-index rule: a file modified at or after the signatures were taken could have
+                    # changed again within the same timestamp tick, so its signature proves nothing
+                    racily_clean = stat.st_mtime_ns >= trusted_before_ns - _TIMESTAMP_SLACK_NS
+                    if not racily_clean and known_signatures.get(relative_path) == signature:
+                        file_items.append(
+                            FileItem(file_path=relative_path, content=None, signature=signature))
+                        continue
+
+                    raw = self._read_text_candidate(file_path)
+                    if raw is None:
+                        logger.info("Skipping binary file: %s", relative_path)
+                        continue
 
                     try:
-                        with open(file_path, encoding='utf-8', errors='strict') as f:
-                            content = f.read()
+                        content = raw.decode('utf-8', errors='strict')
                     except UnicodeDecodeError:
-                        print(
-                            f"Warning: Could not decode {relative_path} as UTF-8. Reading with replacement characters.")
-                        with open(file_path, encoding='utf-8', errors='replace') as f:
-                            content = f.read()
+                        logger.warning(
+                            "Could not decode %s as UTF-8. Reading with replacement characters.", relative_path)
+                        content = raw.decode('utf-8', errors='replace')
+                    # Match the universal newline handling of text-mode reads
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
 
                 if content is not None:
                     file_items.append(
-                        FileItem(file_path=relative_path, content=content))
+                        FileItem(file_path=relative_path, content=content, signature=signature))
 
+            except PermissionError:
+                logger.warning("Skipping unreadable file: %s", relative_path)
             except Exception as e:
-                print(f"Warning: Could not process file {relative_path}: {e}")
+                logger.warning("Could not process file %s: %s", relative_path, e)
 
         return file_items
 
+    def _read_text_candidate(self, file_path: Path) -> bytes | None:
+        """Reads a file in a single pass, returning None if its first KiB looks binary."""
+        with open(file_path, 'rb') as f:
+            fd = f.fileno()
+            # Each file is read once, front to back: ask for aggressive readahead
+            _fadvise(fd, 'POSIX_FADV_SEQUENTIAL')
+            head = f.read(1024)
+            if b'\0' in head:
+                return None
+            raw = head + f.read()
+            if len(raw) > _DROP_CACHE_THRESHOLD:
+                # Large files are not needed again, so keep them from evicting hotter pages
+                _fadvise(fd, 'POSIX_FADV_DONTNEED')
+        return raw
+
     def _discover_paths(self, config: AggregateConfig) -> list[Path]:
         project_root = config.project_root
         all_files = set()
@@ -134,17 +180,19 @@ class FileSystemFileRepository(IFileRepository):
 
     def load_hashes(self, path: Path) -> dict[str, str]:
         if path.is_file():
-            with open(path, encoding='utf-8') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return {}
+            # json.loads accepts bytes directly, which skips the text-mode decoding layer
+            try:
+                hashes: dict[str, str] = json.loads(path.read_bytes())
+                return hashes
+            except json.JSONDecodeError:
+                return {}
         return {}
 
     def save_hashes(self, path: Path, hashes: dict[str, str]) -> None:
         path.parent.mkdir(exist_ok=True)
+        # This is an internal cache, so write it compactly rather than human-readable
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(hashes, f, indent=2)
+            json.dump(hashes, f, separators=(',', ':'))
 
 
 class FileSystemChangeSetRepository(IChangeSetRepository):
@@ -1,10 +1,33 @@
 # aicodec/infrastructure/utils.py
+import logging
+import logging.handlers
 import os
+import queue
 import subprocess
 import sys
 from pathlib import Path
 
 
+def start_logging(level: int) -> logging.handlers.QueueListener | None:
+    """Routes aicodec log records through a queue so the writes to stderr happen off the calling thread.
+
+    Only the CLI entry point should call this. Returns None if the handler is already installed.
+    """
+    logger = logging.getLogger("aicodec")
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers):
+        return None
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
+    logger.setLevel(level)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+
 def open_file_in_editor(path: str | Path) -> bool:
     """Tries to open the given file path and returns True on success, False on failure."""
     path_str = str(path)
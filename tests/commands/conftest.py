@@ -0,0 +1,42 @@
+# tests/commands/conftest.py
+import os
+
+import pytest
+
+from aicodec.infrastructure.cli.commands import update
+
+
+@pytest.fixture(autouse=True)
+def _fresh_install_probes():
+    """The install probes are cached per process; each test patches its own environment, so start uncached."""
+    for probe in (update.get_running_binary_path, update.is_frozen_binary, update.is_prebuilt_install):
+        probe.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _keep_cwd():
+    """Command tests chdir through monkeypatch, sometimes inside a fake filesystem; the real cwd must come back."""
+    cwd = os.getcwd()
+    yield
+    assert os.getcwd() == cwd
+
+
+@pytest.fixture(scope="session")
+def dummy_binary(tmp_path_factory):
+    """A placeholder aicodec binary shared by tests that only need the path to exist, not to modify it."""
+    binary_path = tmp_path_factory.mktemp("bin") / "aicodec"
+    binary_path.touch()
+    return binary_path
+
+
+@pytest.fixture(scope="session")
+def symlinked_binary(tmp_path_factory):
+    """A placeholder binary under real/ plus a bin/ symlink pointing at it, shared read-only like `dummy_binary`."""
+    root = tmp_path_factory.mktemp("symlinked")
+    binary_path = root / "real" / "aicodec"
+    binary_path.parent.mkdir()
+    binary_path.touch()
+    symlink_path = root / "bin" / "aicodec"
+    symlink_path.parent.mkdir()
+    symlink_path.symlink_to(binary_path)
+    return binary_path, symlink_path
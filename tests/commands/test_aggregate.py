@@ -22,7 +22,7 @@ def test_aggregate_run_basic(sample_project, aicodec_config_file, monkeypatch):
 
     context_file = sample_project / ".aicodec" / "context.json"
     assert context_file.exists()
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
 
     assert "main.py" in filepaths
@@ -47,7 +47,7 @@ def test_aggregate_run_no_gitignore(sample_project, aicodec_config_file, monkeyp
     aggregate.run(args)
 
     context_file = sample_project / ".aicodec" / "context.json"
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
 
     assert "app.log" in filepaths  # Should be included now
@@ -70,7 +70,7 @@ def test_aggregate_run_with_overrides(sample_project, aicodec_config_file, monke
     aggregate.run(args)
 
     context_file = sample_project / ".aicodec" / "context.json"
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
 
     assert "dist/bundle.js" in filepaths  # Included via include glob
@@ -115,7 +115,7 @@ def test_aggregate_exclude_nested_dir(sample_project, aicodec_config_file, monke
     aggregate.run(args)
 
     context_file = sample_project / ".aicodec" / "context.json"
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
 
     assert "ex/dir/nested.py" not in filepaths
@@ -140,7 +140,7 @@ def test_aggregate_include_nested_dir(sample_project, aicodec_config_file, monke
     aggregate.run(args)
 
     context_file = sample_project / ".aicodec" / "context.json"
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
 
     assert "node_modules/submodule/subpackage.js" in filepaths
@@ -164,7 +164,7 @@ def test_aggregate_with_plugin(sample_project, aicodec_config_file, monkeypatch)
 
     context_file = sample_project / ".aicodec" / "context.json"
     assert context_file.exists()
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
 
     plugin_output_found = False
     for item in data:
@@ -193,7 +193,7 @@ def test_aggregate_with_cli_plugin(sample_project, aicodec_config_file, monkeypa
     aggregate.run(args)
 
     context_file = sample_project / ".aicodec" / "context.json"
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     
     plugin_output_found = False
     for item in data:
@@ -223,7 +223,7 @@ def test_aggregate_with_cli_plugin_override(sample_project, aicodec_config_file,
     aggregate.run(args)
 
     context_file = sample_project / ".aicodec" / "context.json"
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
 
     plugin_output_found = False
     for item in data:
@@ -258,7 +258,7 @@ def test_aggregate_run_with_outside_paths(sample_project_with_outside_dir, monke
 
     context_file = project_dir / ".aicodec" / "context.json"
     assert context_file.exists()
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
 
     assert "../other_dir/other_file.txt" in filepaths
@@ -279,7 +279,7 @@ def test_aggregate_run_with_outside_paths(sample_project_with_outside_dir, monke
     aggregate.run(args_absolute)
 
     assert context_file.exists()
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
     assert "../other_dir/other_file.txt" in filepaths
     assert "main.py" not in filepaths
@@ -298,7 +298,7 @@ def test_aggregate_run_with_outside_paths(sample_project_with_outside_dir, monke
     aggregate.run(args_both)
 
     assert context_file.exists()
-    data = json.loads(context_file.read_text())
+    data = json.loads(context_file.read_bytes())
     filepaths = {item['filePath'] for item in data}
     assert "../other_dir/other_file.txt" in filepaths
     assert "main.py" in filepaths
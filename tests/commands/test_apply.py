@@ -3,19 +3,24 @@ import json
 from argparse import Namespace
 from unittest.mock import patch
 
+import pytest
+
 from aicodec.infrastructure.cli.commands import apply
 
 
-def test_apply_run_basic(sample_project, aicodec_config_file, sample_changes_file, monkeypatch):
+@pytest.fixture
+def config_with_changes(aicodec_config_file, aicodec_config_dict, sample_changes_file):
+    """Point the sample config at the sample changes file."""
+    aicodec_config_dict["prepare"]["changes"] = str(sample_changes_file)
+    aicodec_config_file.write_text(json.dumps(aicodec_config_dict))
+    return aicodec_config_file
+
+
+def test_apply_run_basic(sample_project, config_with_changes, monkeypatch):
     """Test apply command launches the review server."""
     monkeypatch.chdir(sample_project)
 
-    # Point config to the sample changes file
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data["prepare"]["changes"] = str(sample_changes_file)
-    aicodec_config_file.write_text(json.dumps(config_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, changes=None, all=False, files=None)
+    args = Namespace(config=str(config_with_changes), output_dir=None, changes=None, all=False, files=None)
 
     with patch("aicodec.infrastructure.cli.commands.apply.launch_review_server") as mock_launch:
         apply.run(args)
@@ -42,15 +47,11 @@ def test_apply_run_with_overrides(sample_project, aicodec_config_file, sample_ch
         assert review_service.changes_file == sample_changes_file.resolve()
 
 
-def test_apply_run_all_flag(sample_project, aicodec_config_file, sample_changes_file, monkeypatch, capsys):
+def test_apply_run_all_flag(sample_project, config_with_changes, monkeypatch, capsys):
     """Test apply command with --all flag bypasses the UI."""
     monkeypatch.chdir(sample_project)
 
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data["prepare"]["changes"] = str(sample_changes_file)
-    aicodec_config_file.write_text(json.dumps(config_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, changes=None, all=True, files=None)
+    args = Namespace(config=str(config_with_changes), output_dir=None, changes=None, all=True, files=None)
 
     with (
         patch("aicodec.infrastructure.cli.commands.apply.launch_review_server") as mock_launch,
@@ -89,15 +90,11 @@ def test_apply_run_missing_config(sample_project, monkeypatch, capsys):
     assert "Error: Missing required configuration" in captured.out
 
 
-def test_apply_run_with_files_single(sample_project, aicodec_config_file, sample_changes_file, monkeypatch, capsys):
+def test_apply_run_with_files_single(sample_project, config_with_changes, monkeypatch, capsys):
     """Test apply command with --files flag for a single file."""
     monkeypatch.chdir(sample_project)
 
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data["prepare"]["changes"] = str(sample_changes_file)
-    aicodec_config_file.write_text(json.dumps(config_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, changes=None, all=False, files=["a.py"])
+    args = Namespace(config=str(config_with_changes), output_dir=None, changes=None, all=False, files=["a.py"])
 
     with (
         patch("aicodec.infrastructure.cli.commands.apply.launch_review_server") as mock_launch,
@@ -129,15 +126,11 @@ def test_apply_run_with_files_single(sample_project, aicodec_config_file, sample
         assert "Apply complete" in captured.out
 
 
-def test_apply_run_with_files_multiple(sample_project, aicodec_config_file, sample_changes_file, monkeypatch, capsys):
+def test_apply_run_with_files_multiple(sample_project, config_with_changes, monkeypatch, capsys):
     """Test apply command with --files flag for multiple files."""
     monkeypatch.chdir(sample_project)
 
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data["prepare"]["changes"] = str(sample_changes_file)
-    aicodec_config_file.write_text(json.dumps(config_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, changes=None, all=False, files=["a.py", "b.py"])
+    args = Namespace(config=str(config_with_changes), output_dir=None, changes=None, all=False, files=["a.py", "b.py"])
 
     with (
         patch("aicodec.infrastructure.cli.commands.apply.launch_review_server") as mock_launch,
@@ -170,16 +163,12 @@ def test_apply_run_with_files_multiple(sample_project, aicodec_config_file, samp
         assert "Found 2 change(s) to apply." in captured.out
 
 
-def test_apply_run_with_files_not_found(sample_project, aicodec_config_file, sample_changes_file, monkeypatch, capsys):
+def test_apply_run_with_files_not_found(sample_project, config_with_changes, monkeypatch, capsys):
     """Test apply command with --files flag when specified file is not in changes."""
     monkeypatch.chdir(sample_project)
 
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data["prepare"]["changes"] = str(sample_changes_file)
-    aicodec_config_file.write_text(json.dumps(config_data))
-
     args = Namespace(
-        config=str(aicodec_config_file), output_dir=None, changes=None, all=False, files=["nonexistent.py"]
+        config=str(config_with_changes), output_dir=None, changes=None, all=False, files=["nonexistent.py"]
     )
 
     with patch("aicodec.infrastructure.cli.commands.apply.ReviewService") as mock_review_service_class:
@@ -198,17 +187,13 @@ def test_apply_run_with_files_not_found(sample_project, aicodec_config_file, sam
 
 
 def test_apply_run_with_files_partial_match(
-    sample_project, aicodec_config_file, sample_changes_file, monkeypatch, capsys
+    sample_project, config_with_changes, monkeypatch, capsys
 ):
     """Test apply command with --files flag when some files are found and some are not."""
     monkeypatch.chdir(sample_project)
 
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data["prepare"]["changes"] = str(sample_changes_file)
-    aicodec_config_file.write_text(json.dumps(config_data))
-
     args = Namespace(
-        config=str(aicodec_config_file), output_dir=None, changes=None, all=False, files=["a.py", "nonexistent.py"]
+        config=str(config_with_changes), output_dir=None, changes=None, all=False, files=["a.py", "nonexistent.py"]
     )
 
     with patch("aicodec.infrastructure.cli.commands.apply.ReviewService") as mock_review_service_class:
@@ -4,22 +4,22 @@ from argparse import Namespace
 from aicodec.infrastructure.cli.commands import buildmap
 
 
-def test_buildmap_run_respects_gitignore(sample_project, aicodec_config_file, monkeypatch):
+def test_buildmap_run_respects_gitignore(fake_sample_project, monkeypatch):
     """Test buildmap command creates a map and respects .gitignore by default."""
-    monkeypatch.chdir(sample_project)
+    monkeypatch.chdir(fake_sample_project)
 
     # Add an extra file that should be ignored by config but not by buildmap
-    (sample_project / "docs").mkdir(exist_ok=True)
-    (sample_project / "docs" / "extra.md").write_text("doc")
+    (fake_sample_project / "docs").mkdir(exist_ok=True)
+    (fake_sample_project / "docs" / "extra.md").write_text("doc")
 
     # Modify config to exclude markdown, which buildmap should ignore
-    config_path = sample_project / ".aicodec" / "config.json"
+    config_path = fake_sample_project / ".aicodec" / "config.json"
     config_path.write_text('{"aggregate": {"exclude": ["**/*.md"]}}')
 
     args = Namespace(config=str(config_path), use_gitignore=True)
     buildmap.run(args)
 
-    repo_map_file = sample_project / ".aicodec" / "repo_map.md"
+    repo_map_file = fake_sample_project / ".aicodec" / "repo_map.md"
     assert repo_map_file.exists()
 
     content = repo_map_file.read_text()
@@ -56,14 +56,15 @@ def test_buildmap_run_no_gitignore(sample_project, aicodec_config_file, monkeypa
     assert "package.js" in content
 
 
-def test_buildmap_creates_correct_tree_structure(sample_project, aicodec_config_file, monkeypatch):
+def test_buildmap_creates_correct_tree_structure(fake_sample_project, monkeypatch):
     """Test that the generated repo map has the correct tree structure."""
-    monkeypatch.chdir(sample_project)
+    monkeypatch.chdir(fake_sample_project)
 
-    args = Namespace(config=str(aicodec_config_file), use_gitignore=True)
+    config_path = fake_sample_project / ".aicodec" / "config.json"
+    args = Namespace(config=str(config_path), use_gitignore=True)
     buildmap.run(args)
 
-    repo_map_file = sample_project / ".aicodec" / "repo_map.md"
+    repo_map_file = fake_sample_project / ".aicodec" / "repo_map.md"
     content = repo_map_file.read_text()
 
     expected_content = "\n".join([
@@ -1,39 +1,50 @@
 # tests/commands/test_init.py
 import json
 from argparse import Namespace
-from unittest.mock import patch
 
-from aicodec.infrastructure.cli.commands import init
+import pytest
 
+from aicodec.infrastructure.cli.commands import init
 
-def test_init_run_defaults(tmp_path, monkeypatch):
-    """Test `init` with default 'yes' for most prompts and skipping advanced config."""
+DEFAULT_USER_INPUTS = [
+    '',  # Directories to scan
+    'y',  # Standard gitignore prompts
+    'y',
+    'y',
+    'n',  # Configure additional?
+    'n',  # Use minimal prompt?
+    'Python',  # Tech stack
+    'y',  # Include repository map?
+    'n',  # from_clipboard
+    'y',  # include_code
+    'y',  # prompt to clipboard
+]
+
+
+def _scripted_input(answers):
+    """Returns a plain `input` replacement that yields the given answers in order."""
+    remaining = iter(answers)
+    return lambda _prompt="": next(remaining)
+
+
+@pytest.mark.parametrize("plugins", [
+    [],
+    [".zip=unzip -l {file}", ".tar.gz=tar -ztvf {file}"],
+], ids=["no-plugins", "with-plugins"])
+def test_init_run_defaults(tmp_path, monkeypatch, plugins):
+    """Test `init` with default 'yes' for most prompts, skipping advanced config, with and without CLI plugins."""
     monkeypatch.chdir(tmp_path)
 
-    user_inputs = [
-        '',  # Directories to scan
-        'y',  # Standard gitignore prompts
-        'y',
-        'y',
-        'n',  # Configure additional?
-        'n',  # Use minimal prompt?
-        'Python',  # Tech stack
-        'y',  # Include repository map?
-        'n',  # from_clipboard
-        'y',  # include_code
-        'y',  # prompt to clipboard
-    ]
-
-    with patch('builtins.input', side_effect=user_inputs):
-        init.run(Namespace(plugin=[]))
+    monkeypatch.setattr('builtins.input', _scripted_input(DEFAULT_USER_INPUTS))
+    init.run(Namespace(plugin=plugins))
 
     config_file = tmp_path / '.aicodec' / 'config.json'
     assert config_file.exists()
-    config = json.loads(config_file.read_text())
+    config = json.loads(config_file.read_bytes())
 
     assert config['aggregate']['use_gitignore'] is True
     assert '.gitignore' in config['aggregate']['exclude']
-    assert config['aggregate']['plugins'] == []
+    assert config['aggregate']['plugins'] == plugins
     assert config['prompt']['minimal'] is False
     assert config['prompt']['tech_stack'] == 'Python'
     assert config['prompt']['include_map'] is True
@@ -53,8 +64,8 @@ def test_init_run_overwrite_cancel(tmp_path, monkeypatch):
     config_file = config_dir / 'config.json'
     config_file.write_text('{"original": true}')
 
-    with patch('builtins.input', return_value='n'):
-        init.run(Namespace(plugin=[]))
+    monkeypatch.setattr('builtins.input', lambda *_: 'n')
+    init.run(Namespace(plugin=[]))
 
     assert config_file.read_text() == '{"original": true}'
 
@@ -79,11 +90,11 @@ def test_init_run_advanced_config(tmp_path, monkeypatch):
         'y',  # prompt to clipboard
     ]
 
-    with patch('builtins.input', side_effect=user_inputs):
-        init.run(Namespace(plugin=[]))
+    monkeypatch.setattr('builtins.input', _scripted_input(user_inputs))
+    init.run(Namespace(plugin=[]))
 
     config_file = tmp_path / '.aicodec' / 'config.json'
-    config = json.loads(config_file.read_text())
+    config = json.loads(config_file.read_bytes())
     agg_config = config['aggregate']
 
     assert agg_config['include'] == ['src/**', 'lib/**']
@@ -94,40 +105,3 @@ def test_init_run_advanced_config(tmp_path, monkeypatch):
     assert config['prompt']['include_map'] is False
     assert config['prepare']['from_clipboard'] is True
     assert config['prompt']['clipboard'] is True
-
-
-def test_init_with_plugins(tmp_path, monkeypatch):
-    """Test `init` with plugins provided via CLI."""
-    monkeypatch.chdir(tmp_path)
-
-    user_inputs = [
-        '',  # Directories to scan
-        'y',  # Standard gitignore prompts
-        'y',
-        'y',
-        'n',  # Configure additional?
-        'n',  # Use minimal prompt?
-        'Python',  # Tech stack
-        'y',  # Include repository map?
-        'n',  # from_clipboard
-        'y',  # include_code
-        'y',  # prompt to clipboard
-    ]
-    
-    plugins_to_add = [
-        ".zip=unzip -l {file}",
-        ".tar.gz=tar -ztvf {file}"
-    ]
-
-    with patch('builtins.input', side_effect=user_inputs):
-        init.run(Namespace(plugin=plugins_to_add))
-
-    config_file = tmp_path / '.aicodec' / 'config.json'
-    assert config_file.exists()
-    config = json.loads(config_file.read_text())
-
-    expected_plugins = [
-        ".zip=unzip -l {file}",
-        ".tar.gz=tar -ztvf {file}"
-    ]
-    assert config['aggregate']['plugins'] == expected_plugins
@@ -1,6 +1,8 @@
 from argparse import Namespace
 from unittest.mock import patch
 
+from pyperclip import PyperclipException
+
 from aicodec.infrastructure.cli.commands import prepare
 
 
@@ -19,17 +21,7 @@ def test_prepare_run_from_clipboard_pyperclip_exception(sample_project, aicodec_
     # to calling open_file_in_editor. We must mock both.
     with patch('aicodec.infrastructure.cli.commands.prepare.pyperclip.paste') as mock_paste, \
          patch('aicodec.infrastructure.cli.commands.prepare.open_file_in_editor') as mock_open:
-        
-        # Dynamically get the exception type to avoid import errors if pyperclip is not installed
-        class DummyExc(Exception):
-            pass
-        try:
-            from pyperclip import PyperclipException
-            exc_type = PyperclipException
-        except ImportError:
-            exc_type = DummyExc
-
-        mock_paste.side_effect = exc_type("No clipboard found")
+        mock_paste.side_effect = PyperclipException("No clipboard found")
         prepare.run(args)
 
     captured = capsys.readouterr()
@@ -1,58 +1,81 @@
 # tests/commands/test_prompt.py
 import json
 from argparse import Namespace
-from unittest.mock import patch
+from pathlib import Path
+
+import pytest
 
 from aicodec.infrastructure.cli.commands import prompt
 
+ASSETS_DIR = Path(prompt.__file__).resolve().parents[3] / "assets"
 
-def test_prompt_run_basic(sample_project, aicodec_config_file, monkeypatch):
-    """Test basic prompt command generates a file with context but no map."""
-    monkeypatch.chdir(sample_project)
-    (sample_project / ".aicodec" / "context.json").write_text('[]')
-
-    args = Namespace(
-        config=str(aicodec_config_file),
-        task="A test task",
-        minimal=False, tech_stack=None, output_file=None, clipboard=False,
-        exclude_output_instructions=False, is_new_project=False, exclude_code=False,
-        include_map=None,  # Use default from config (False)
-        skip_editor=False,
-        output_guide=False
-    )
 
-    with patch('aicodec.infrastructure.cli.commands.prompt.open_file_in_editor', return_value=True):
-        prompt.run(args)
+_DEFAULT_PROMPT_ARGS = dict(
+    task="A test task",
+    minimal=False, tech_stack=None, output_file=None, clipboard=False,
+    exclude_output_instructions=False, is_new_project=False, exclude_code=False,
+    include_map=None,  # Use default from config
+    skip_editor=False,
+    output_guide=False,
+)
 
-    prompt_file = sample_project / ".aicodec" / "prompt.txt"
-    assert prompt_file.exists()
-    content = prompt_file.read_text()
 
-    assert "A test task" in content
-    assert "<code_context>" in content
-    assert "<repository_map>" not in content
+def make_prompt_args(config, **overrides):
+    """Builds the parsed CLI arguments for `prompt.run`, overriding the defaults above."""
+    return Namespace(**{**_DEFAULT_PROMPT_ARGS, "config": str(config), **overrides})
+
+
+def assert_contains_all(content, needles):
+    missing = [needle for needle in needles if needle not in content]
+    assert not missing, f"Missing from prompt: {missing}"
+
+
+def assert_contains_none(content, needles):
+    present = [needle for needle in needles if needle in content]
+    assert not present, f"Unexpected in prompt: {present}"
+
+
+OUTPUT_GUIDE_BASICS = ["<output_instructions>", "JSON Schema:"]
+OUTPUT_GUIDE_EXTRAS = ["<action_rules>", "<coding_standard>", "<preflight_checking>"]
+
+
+@pytest.fixture
+def sample_project(fake_sample_project, fs):
+    """Prompt tests run on the in-memory project, with the packaged templates and schema mapped in read-only."""
+    fs.add_real_directory(ASSETS_DIR)
+    return fake_sample_project
 
 
-@patch('pyperclip.copy')
-def test_prompt_run_include_map_flag(mock_copy, sample_project, aicodec_config_file, monkeypatch):
+@pytest.fixture
+def aicodec_config_file(fake_sample_project):
+    return fake_sample_project / ".aicodec" / "config.json"
+
+
+@pytest.fixture(autouse=True)
+def _no_editor(fs, monkeypatch):
+    """Never launch a real editor on the generated prompt file.
+
+    Requesting `fs` first makes `monkeypatch` undo its chdir while the fake filesystem is still active.
+    """
+    monkeypatch.setattr('aicodec.infrastructure.cli.commands.prompt.open_file_in_editor', lambda *_args: True)
+
+
+def test_prompt_run_include_map_flag(sample_project, aicodec_config_file, monkeypatch, record_calls):
     """Test prompt command with --include-map includes a pre-existing repo map."""
     monkeypatch.chdir(sample_project)
     map_content = ".\n└── main.py"
     (sample_project / ".aicodec" / "repo_map.md").write_text(map_content)
 
-    args = Namespace(
-        config=str(aicodec_config_file),
-        task="A map task",
-        minimal=False, tech_stack=None, output_file=None, clipboard=True,
-        exclude_output_instructions=False, is_new_project=False, exclude_code=True,
-        include_map=True,  # Explicitly include
-        output_guide=False
+    args = make_prompt_args(
+        aicodec_config_file,
+        task="A map task", clipboard=True, exclude_code=True, include_map=True,
     )
 
+    copies = record_calls('pyperclip.copy')
     prompt.run(args)
 
-    mock_copy.assert_called_once()
-    content = mock_copy.call_args[0][0]
+    assert len(copies) == 1
+    content = copies[0][0][0]
 
     assert "A map task" in content
     assert "<code_context>" not in content
@@ -60,240 +83,144 @@ def test_prompt_run_include_map_flag(mock_copy, sample_project, aicodec_config_f
     assert map_content in content
 
 
-def test_prompt_run_exclude_map_flag(sample_project, aicodec_config_file, monkeypatch):
-    """Test prompt command with --exclude-map overrides a config default of true."""
+PROMPT_RUN_CASES = [
+    pytest.param(
+        {"context": "[]", "repo_map": None, "config_include_map": False, "args": {}},
+        ["A test task", "<code_context>"], ["<repository_map>"],
+        id="basic",
+    ),
+    pytest.param(
+        {"context": None, "repo_map": ".", "config_include_map": True, "args": {"exclude_code": True, "include_map": False}},
+        [], ["<repository_map>"],
+        id="exclude-map-overrides-config",
+    ),
+    pytest.param(
+        {"context": None, "repo_map": ".", "config_include_map": True, "args": {"exclude_code": True}},
+        ["<repository_map>"], [],
+        id="include-map-from-config",
+    ),
+]
+
+
+@pytest.mark.parametrize("setup, expected, forbidden", PROMPT_RUN_CASES)
+def test_prompt_run_writes_prompt_file(
+    sample_project, aicodec_config_file, aicodec_config_dict, monkeypatch, setup, expected, forbidden
+):
+    """Test the prompt file reflects the pre-existing .aicodec files, the config and the CLI flags."""
     monkeypatch.chdir(sample_project)
-    (sample_project / ".aicodec" / "repo_map.md").write_text(".")
-
-    # Set config to include map by default
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data['prompt']['include_map'] = True
-    aicodec_config_file.write_text(json.dumps(config_data))
-
-    args = Namespace(
-        config=str(aicodec_config_file),
-        task="A test task",
-        minimal=False, tech_stack=None, output_file=None, clipboard=False,
-        exclude_output_instructions=False, is_new_project=False, exclude_code=True,
-        include_map=False,  # Explicitly exclude via --exclude-map
-        skip_editor=False,
-        output_guide=False
-    )
+    aicodec_dir = sample_project / ".aicodec"
+    if setup["context"] is not None:
+        (aicodec_dir / "context.json").write_text(setup["context"])
+    if setup["repo_map"] is not None:
+        (aicodec_dir / "repo_map.md").write_text(setup["repo_map"])
+    if setup["config_include_map"]:
+        aicodec_config_dict["prompt"]["include_map"] = True
+        aicodec_config_file.write_text(json.dumps(aicodec_config_dict, indent=2))
+
+    prompt.run(make_prompt_args(aicodec_config_file, **setup["args"]))
 
-    with patch('aicodec.infrastructure.cli.commands.prompt.open_file_in_editor', return_value=True):
-        prompt.run(args)
+    content = (aicodec_dir / "prompt.txt").read_text()
+    assert_contains_all(content, expected)
+    assert_contains_none(content, forbidden)
+
+
+def test_prompt_warns_if_map_missing(sample_project, aicodec_config_file, monkeypatch, capsys):
+    """Test prompt command warns the user if the repo map file is requested but not found."""
+    monkeypatch.chdir(sample_project)
+
+    # Request map that doesn't exist
+    args = make_prompt_args(aicodec_config_file, exclude_code=True, include_map=True)
+
+    prompt.run(args)
+
+    out = capsys.readouterr().out
+    assert "Warning: Repo map file not found" in out
+    assert "Run 'aicodec buildmap' first" in out
 
     prompt_file = sample_project / ".aicodec" / "prompt.txt"
     content = prompt_file.read_text()
     assert "<repository_map>" not in content
 
 
-def test_prompt_run_from_config(sample_project, aicodec_config_file, monkeypatch):
-    """Test prompt command respects include_map=True from config."""
+def test_prompt_run_missing_context(sample_project, aicodec_config_file, monkeypatch, capsys):
+    """Test prompt command exits before touching the session when there is no context to send."""
     monkeypatch.chdir(sample_project)
-    (sample_project / ".aicodec" / "repo_map.md").write_text(".")
-
-    # Set config to include map by default
-    config_data = json.loads(aicodec_config_file.read_text())
-    config_data['prompt']['include_map'] = True
-    aicodec_config_file.write_text(json.dumps(config_data))
-
-    args = Namespace(
-        config=str(aicodec_config_file),
-        task="A test task",
-        minimal=False, tech_stack=None, output_file=None, clipboard=False,
-        exclude_output_instructions=False, is_new_project=False, exclude_code=True,
-        include_map=None,  # Use config
-        skip_editor=False,
-        output_guide=False
-    )
+    revert_file = sample_project / ".aicodec" / "reverts" / "revert-001.json"
+    revert_file.parent.mkdir(parents=True)
+    revert_file.write_text('{}')
 
-    with patch('aicodec.infrastructure.cli.commands.prompt.open_file_in_editor', return_value=True):
-        prompt.run(args)
+    with pytest.raises(SystemExit):
+        prompt.run(make_prompt_args(aicodec_config_file))
 
-    prompt_file = sample_project / ".aicodec" / "prompt.txt"
-    content = prompt_file.read_text()
-    assert "<repository_map>" in content
+    assert "Error: No context available" in capsys.readouterr().out
+    assert revert_file.exists()
+    assert not (sample_project / ".aicodec" / "prompt.txt").exists()
 
-def test_prompt_warns_if_map_missing(sample_project, aicodec_config_file, monkeypatch, capsys):
-    """Test prompt command warns the user if the repo map file is requested but not found."""
+
+@pytest.fixture
+def render_output_guide(sample_project, aicodec_config_file, monkeypatch):
+    """Runs `prompt --output-guide` in the sample project and returns the written prompt file's text."""
     monkeypatch.chdir(sample_project)
 
-    args = Namespace(
-        config=str(aicodec_config_file),
-        task="A test task",
-        minimal=False, tech_stack=None, output_file=None, clipboard=False,
-        exclude_output_instructions=False, is_new_project=False, exclude_code=True,
-        include_map=True,  # Request map that doesn't exist
-        skip_editor=False,
-        output_guide=False
+    def render(**overrides):
+        prompt.run(make_prompt_args(
+            aicodec_config_file, task="Ignored task", skip_editor=True, output_guide=True, **overrides,
+        ))
+        return (sample_project / ".aicodec" / "prompt.txt").read_text()
+
+    return render
+
+
+def test_output_guide_full(render_output_guide):
+    """Test --output-guide outputs only the formatting rules (full version)."""
+    content = render_output_guide(tech_stack="Python")
+
+    # Output instructions plus the full version's extra guidance, but no task or context
+    assert_contains_all(content, OUTPUT_GUIDE_BASICS + OUTPUT_GUIDE_EXTRAS)
+    assert_contains_none(content, ["Ignored task", "<code_context>", "<repository_map>", "<task>"])
+
+
+def test_output_guide_minimal(render_output_guide):
+    """Test --output-guide --minimal outputs only the basic formatting rules."""
+    content = render_output_guide(minimal=True, tech_stack="Python")
+
+    # Minimal version does NOT include extra guidance
+    assert_contains_all(content, OUTPUT_GUIDE_BASICS)
+    assert_contains_none(content, OUTPUT_GUIDE_EXTRAS)
+
+
+def test_output_guide_clipboard(sample_project, aicodec_config_file, monkeypatch, record_calls):
+    """Test --output-guide with --clipboard copies to clipboard."""
+    monkeypatch.chdir(sample_project)
+
+    args = make_prompt_args(
+        aicodec_config_file,
+        task="Ignored task", tech_stack="Python", clipboard=True, skip_editor=True, output_guide=True,
     )
 
-    with patch('aicodec.infrastructure.cli.commands.prompt.open_file_in_editor', return_value=True):
-        prompt.run(args)
+    copies = record_calls('pyperclip.copy')
+    prompt.run(args)
 
-    captured = capsys.readouterr()
-    assert "Warning: Repo map file not found" in captured.out
-    assert "Run 'aicodec buildmap' first" in captured.out
+    assert len(copies) == 1
+    content = copies[0][0][0]
+    assert "<output_instructions>" in content
+    assert "JSON Schema:" in content
 
-    prompt_file = sample_project / ".aicodec" / "prompt.txt"
-    content = prompt_file.read_text()
-    assert "<repository_map>" not in content
 
+def test_output_guide_with_tech_stack(render_output_guide):
+    """Test --output-guide includes tech stack in coding standards."""
+    assert "TypeScript and React" in render_output_guide(tech_stack="TypeScript and React")
+
+
+def test_output_guide_no_reverts_cleared(sample_project, render_output_guide):
+    """Test --output-guide does not clear reverts folder (it's not a new session)."""
+    # Create a revert file
+    reverts_dir = sample_project / ".aicodec" / "reverts"
+    reverts_dir.mkdir(parents=True, exist_ok=True)
+    revert_file = reverts_dir / "revert-001.json"
+    revert_file.write_text('{}')
+
+    render_output_guide(tech_stack="Python")
 
-class TestOutputGuide:
-    """Tests for the --output-guide flag."""
-
-    def test_output_guide_full(self, sample_project, aicodec_config_file, monkeypatch):
-        """Test --output-guide outputs only the formatting rules (full version)."""
-        monkeypatch.chdir(sample_project)
-
-        args = Namespace(
-            config=str(aicodec_config_file),
-            task="Ignored task",
-            minimal=False,
-            tech_stack="Python",
-            output_file=None,
-            clipboard=False,
-            exclude_output_instructions=False,
-            is_new_project=False,
-            exclude_code=False,
-            include_map=None,
-            skip_editor=True,
-            output_guide=True
-        )
-
-        prompt.run(args)
-
-        prompt_file = sample_project / ".aicodec" / "prompt.txt"
-        assert prompt_file.exists()
-        content = prompt_file.read_text()
-
-        # Should contain output instructions
-        assert "<output_instructions>" in content
-        assert "JSON Schema:" in content
-        # Full version includes extra guidance
-        assert "<action_rules>" in content
-        assert "<coding_standard>" in content
-        assert "<preflight_checking>" in content
-        # Should NOT contain task or context
-        assert "Ignored task" not in content
-        assert "<code_context>" not in content
-        assert "<repository_map>" not in content
-        assert "<task>" not in content
-
-    def test_output_guide_minimal(self, sample_project, aicodec_config_file, monkeypatch):
-        """Test --output-guide --minimal outputs only the basic formatting rules."""
-        monkeypatch.chdir(sample_project)
-
-        args = Namespace(
-            config=str(aicodec_config_file),
-            task="Ignored task",
-            minimal=True,
-            tech_stack="Python",
-            output_file=None,
-            clipboard=False,
-            exclude_output_instructions=False,
-            is_new_project=False,
-            exclude_code=False,
-            include_map=None,
-            skip_editor=True,
-            output_guide=True
-        )
-
-        prompt.run(args)
-
-        prompt_file = sample_project / ".aicodec" / "prompt.txt"
-        assert prompt_file.exists()
-        content = prompt_file.read_text()
-
-        # Should contain output instructions
-        assert "<output_instructions>" in content
-        assert "JSON Schema:" in content
-        # Minimal version does NOT include extra guidance
-        assert "<action_rules>" not in content
-        assert "<coding_standard>" not in content
-        assert "<preflight_checking>" not in content
-
-    @patch('pyperclip.copy')
-    def test_output_guide_clipboard(self, mock_copy, sample_project, aicodec_config_file, monkeypatch):
-        """Test --output-guide with --clipboard copies to clipboard."""
-        monkeypatch.chdir(sample_project)
-
-        args = Namespace(
-            config=str(aicodec_config_file),
-            task="Ignored task",
-            minimal=False,
-            tech_stack="Python",
-            output_file=None,
-            clipboard=True,
-            exclude_output_instructions=False,
-            is_new_project=False,
-            exclude_code=False,
-            include_map=None,
-            skip_editor=True,
-            output_guide=True
-        )
-
-        prompt.run(args)
-
-        mock_copy.assert_called_once()
-        content = mock_copy.call_args[0][0]
-        assert "<output_instructions>" in content
-        assert "JSON Schema:" in content
-
-    def test_output_guide_with_tech_stack(self, sample_project, aicodec_config_file, monkeypatch):
-        """Test --output-guide includes tech stack in coding standards."""
-        monkeypatch.chdir(sample_project)
-
-        args = Namespace(
-            config=str(aicodec_config_file),
-            task="Ignored task",
-            minimal=False,
-            tech_stack="TypeScript and React",
-            output_file=None,
-            clipboard=False,
-            exclude_output_instructions=False,
-            is_new_project=False,
-            exclude_code=False,
-            include_map=None,
-            skip_editor=True,
-            output_guide=True
-        )
-
-        prompt.run(args)
-
-        prompt_file = sample_project / ".aicodec" / "prompt.txt"
-        content = prompt_file.read_text()
-
-        assert "TypeScript and React" in content
-
-    def test_output_guide_no_reverts_cleared(self, sample_project, aicodec_config_file, monkeypatch):
-        """Test --output-guide does not clear reverts folder (it's not a new session)."""
-        monkeypatch.chdir(sample_project)
-
-        # Create a revert file
-        reverts_dir = sample_project / ".aicodec" / "reverts"
-        reverts_dir.mkdir(parents=True, exist_ok=True)
-        revert_file = reverts_dir / "revert-001.json"
-        revert_file.write_text('{}')
-
-        args = Namespace(
-            config=str(aicodec_config_file),
-            task="Ignored task",
-            minimal=False,
-            tech_stack="Python",
-            output_file=None,
-            clipboard=False,
-            exclude_output_instructions=False,
-            is_new_project=False,
-            exclude_code=False,
-            include_map=None,
-            skip_editor=True,
-            output_guide=True
-        )
-
-        prompt.run(args)
-
-        # Revert file should still exist
-        assert revert_file.exists()
+    # Revert file should still exist
+    assert revert_file.exists()
@@ -1,241 +1,163 @@
 # tests/commands/test_revert.py
 import json
 from argparse import Namespace
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 
 from aicodec.infrastructure.cli.commands import revert
 
+_REVERT_ALL_MESSAGES = ("Reverting all changes from entire session...", "Revert complete")
 
-@pytest.fixture
-def setup_revert_file(sample_project):
-    reverts_dir = sample_project / ".aicodec" / "reverts"
-    reverts_dir.mkdir(parents=True, exist_ok=True)
-    revert_file = reverts_dir / "revert-001.json"
-    revert_file.write_text(
-        json.dumps({"summary": "revert data", "changes": [{"filePath": "a.py", "action": "DELETE", "content": ""}]})
-    )
-    return revert_file
-
-
-def test_revert_run_basic(sample_project, aicodec_config_file, setup_revert_file, monkeypatch):
-    """Test revert command launches review server when revert.json exists."""
-    monkeypatch.chdir(sample_project)
 
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=False, files=None)
+def assert_in_order(text, needles):
+    """Asserts each needle appears in `text` after the previous one, in a single left-to-right scan."""
+    position = 0
+    for needle in needles:
+        found = text.find(needle, position)
+        assert found >= 0, f"{needle!r} not found after position {position} in:\n{text}"
+        position = found + len(needle)
 
-    with patch("aicodec.infrastructure.cli.commands.revert.launch_review_server") as mock_launch:
-        revert.run(args)
-        mock_launch.assert_called_once()
-        call_args = mock_launch.call_args
-        assert call_args.kwargs["mode"] == "revert"  # Correctly check kwargs
 
+def make_revert_args(config, **overrides):
+    """Builds the parsed CLI arguments for `revert.run`, overriding the defaults."""
+    return Namespace(**{"output_dir": None, "all": False, "files": None, "config": str(config), **overrides})
 
-def test_revert_run_no_revert_file(sample_project, aicodec_config_file, monkeypatch, capsys):
-    """Test revert command prints an error if revert.json is missing."""
-    monkeypatch.chdir(sample_project)
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=False, files=None)
-
-    revert.run(args)
-    captured = capsys.readouterr()
-    assert "Error: No revert data found" in captured.out
-
-
-def test_revert_run_with_override(sample_project, aicodec_config_file, setup_revert_file, monkeypatch):
-    """Test revert command with output_dir override."""
-    # We change directory to parent to ensure the override is working
-    monkeypatch.chdir(sample_project.parent)
 
-    args = Namespace(
-        config=str(aicodec_config_file),
-        output_dir=sample_project,  # Explicitly point to the project dir
-        all=False,
-        files=None,
-    )
-
-    with patch("aicodec.infrastructure.cli.commands.revert.launch_review_server") as mock_launch:
-        revert.run(args)
-        mock_launch.assert_called_once()
+@pytest.fixture
+def sample_project(fake_sample_project):
+    """Revert tests only read and write JSON under .aicodec, so they run on the in-memory project."""
+    return fake_sample_project
 
-        review_service = mock_launch.call_args[0][0]
-        assert review_service.output_dir == sample_project.resolve()
-        # Check for the new revert file location (newest revert file)
-        assert review_service.changes_file == (sample_project / ".aicodec" / "reverts" / "revert-001.json").resolve()
 
+@pytest.fixture
+def aicodec_config_file(fake_sample_project):
+    return fake_sample_project / ".aicodec" / "config.json"
 
-def test_revert_run_all_flag(sample_project, aicodec_config_file, setup_revert_file, monkeypatch, capsys):
-    """Test revert command with --all flag bypasses the UI."""
-    monkeypatch.chdir(sample_project)
 
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=True, files=None)
+# Serialized once at import; the fixture writes these bytes verbatim
+_REVERT_BYTES = json.dumps(
+    {"summary": "revert data", "changes": [{"filePath": "a.py", "action": "DELETE", "content": ""}]}
+).encode()
 
-    with (
-        patch("aicodec.infrastructure.cli.commands.revert.launch_review_server") as mock_launch,
-        patch("aicodec.infrastructure.cli.commands.revert.ReviewService") as mock_review_service_class,
-    ):
 
-        mock_service_instance = mock_review_service_class.return_value
-        mock_service_instance.get_review_context.return_value = {
-            "changes": [{"filePath": "a.py", "proposed_content": "", "action": "DELETE"}]
-        }
-        mock_service_instance.apply_changes.return_value = [{"status": "SUCCESS"}]
+@pytest.fixture
+def setup_revert_file(sample_project):
+    reverts_dir = sample_project / ".aicodec" / "reverts"
+    reverts_dir.mkdir()
+    revert_file = reverts_dir / "revert-001.json"
+    revert_file.write_bytes(_REVERT_BYTES)
+    return revert_file
 
-        revert.run(args)
 
-        mock_launch.assert_not_called()
-        mock_service_instance.apply_changes.assert_called_once()
+@pytest.fixture
+def revert_mocks(record_calls):
+    """Stubs out the review server and ReviewService; tests fill in `service` return values as needed."""
+    launches = record_calls("aicodec.infrastructure.cli.commands.revert.launch_review_server")
+    with patch("aicodec.infrastructure.cli.commands.revert.ReviewService") as review_service_class:
+        yield SimpleNamespace(launches=launches, service=review_service_class.return_value)
+
+
+@pytest.mark.parametrize("all_flag", [False, True], ids=["review-ui", "all"])
+def test_revert_run(sample_project, aicodec_config_file, setup_revert_file, revert_mocks, capsys, all_flag):
+    """Test revert command launches the review server, or bypasses the UI with --all."""
+    args = make_revert_args(aicodec_config_file, all=all_flag)
+    revert_mocks.service.get_review_context.return_value = {
+        "changes": [{"filePath": "a.py", "proposed_content": "", "action": "DELETE"}]
+    }
+    revert_mocks.service.apply_changes.return_value = [{"status": "SUCCESS"}]
 
-        captured = capsys.readouterr()
-        assert "Reverting all changes from entire session..." in captured.out
-        assert "Revert complete" in captured.out
+    revert.run(args)
 
+    if all_flag:
+        assert revert_mocks.launches == []
+        revert_mocks.service.apply_changes.assert_called_once()
+        assert_in_order(capsys.readouterr().out, _REVERT_ALL_MESSAGES)
+    else:
+        assert len(revert_mocks.launches) == 1
+        _launch_args, launch_kwargs = revert_mocks.launches[0]
+        assert launch_kwargs["mode"] == "revert"
+        revert_mocks.service.apply_changes.assert_not_called()
 
-def test_revert_run_with_files_single(sample_project, aicodec_config_file, setup_revert_file, monkeypatch, capsys):
-    """Test revert command with --files flag for a single file."""
-    monkeypatch.chdir(sample_project)
 
-    # Update revert file to have multiple files
-    revert_data = {
-        "summary": "revert data",
-        "changes": [
-            {"filePath": "a.py", "action": "DELETE", "content": ""},
-            {"filePath": "b.py", "action": "REPLACE", "content": "old content"},
-        ],
-    }
-    setup_revert_file.write_text(json.dumps(revert_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=False, files=["a.py"])
+def test_revert_run_no_revert_file(sample_project, aicodec_config_file, capsys):
+    """Test revert command prints an error if revert.json is missing."""
+    args = make_revert_args(aicodec_config_file)
 
-    with (
-        patch("aicodec.infrastructure.cli.commands.revert.launch_review_server") as mock_launch,
-        patch("aicodec.infrastructure.cli.commands.revert.ReviewService") as mock_review_service_class,
-    ):
+    revert.run(args)
+    assert "Error: No revert data found" in capsys.readouterr().out
 
-        mock_service_instance = mock_review_service_class.return_value
-        mock_service_instance.get_review_context.return_value = {
-            "changes": [
-                {"filePath": "a.py", "action": "DELETE", "proposed_content": ""},
-                {"filePath": "b.py", "action": "REPLACE", "proposed_content": "old content"},
-            ]
-        }
-        mock_service_instance.apply_changes.return_value = [{"status": "SUCCESS"}]
 
-        revert.run(args)
+def test_revert_run_with_override(sample_project, aicodec_config_file, setup_revert_file, record_calls):
+    """Test revert command with output_dir override."""
+    args = make_revert_args(aicodec_config_file, output_dir=sample_project)
 
-        mock_launch.assert_not_called()
-        mock_service_instance.apply_changes.assert_called_once()
+    launches = record_calls("aicodec.infrastructure.cli.commands.revert.launch_review_server")
+    revert.run(args)
 
-        # Verify only one file was reverted
-        call_args = mock_service_instance.apply_changes.call_args[0][0]
-        assert len(call_args) == 1
-        assert call_args[0]["filePath"] == "a.py"
+    assert len(launches) == 1
+    review_service = launches[0][0][0]
+    assert review_service.output_dir == sample_project.resolve()
+    # Check for the new revert file location (newest revert file)
+    assert review_service.changes_file == (sample_project / ".aicodec" / "reverts" / "revert-001.json").resolve()
 
-        captured = capsys.readouterr()
-        assert "Reverting changes for 1 file(s) across all sessions..." in captured.out
-        assert "Reverting 1 change(s)..." in captured.out
-        assert "Revert complete" in captured.out
 
+REVERT_CHANGES = [
+    {"filePath": "a.py", "action": "DELETE", "content": ""},
+    {"filePath": "b.py", "action": "REPLACE", "content": "old content"},
+    {"filePath": "c.py", "action": "CREATE", "content": "new content"},
+]
+_REVERT_CHANGES_BYTES = json.dumps({"summary": "revert data", "changes": REVERT_CHANGES}).encode()
 
-def test_revert_run_with_files_multiple(sample_project, aicodec_config_file, setup_revert_file, monkeypatch, capsys):
-    """Test revert command with --files flag for multiple files."""
-    monkeypatch.chdir(sample_project)
 
-    # Update revert file to have multiple files
-    revert_data = {
-        "summary": "revert data",
+@pytest.mark.parametrize("files, reverted", [
+    (["a.py"], ["a.py"]),
+    (["a.py", "b.py"], ["a.py", "b.py"]),
+    (["a.py", "nonexistent.py"], ["a.py"]),
+], ids=["single", "multiple", "partial-match"])
+def test_revert_run_with_files(
+    sample_project, aicodec_config_file, setup_revert_file, revert_mocks, capsys, files, reverted
+):
+    """Test revert command with --files flag reverts only the requested files that have revert data."""
+    setup_revert_file.write_bytes(_REVERT_CHANGES_BYTES)
+    args = make_revert_args(aicodec_config_file, files=files)
+    revert_mocks.service.get_review_context.return_value = {
         "changes": [
-            {"filePath": "a.py", "action": "DELETE", "content": ""},
-            {"filePath": "b.py", "action": "REPLACE", "content": "old content"},
-            {"filePath": "c.py", "action": "CREATE", "content": "new content"},
-        ],
+            {"filePath": c["filePath"], "action": c["action"], "proposed_content": c["content"]}
+            for c in REVERT_CHANGES
+        ]
     }
-    setup_revert_file.write_text(json.dumps(revert_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=False, files=["a.py", "b.py"])
-
-    with (
-        patch("aicodec.infrastructure.cli.commands.revert.launch_review_server") as mock_launch,
-        patch("aicodec.infrastructure.cli.commands.revert.ReviewService") as mock_review_service_class,
-    ):
-
-        mock_service_instance = mock_review_service_class.return_value
-        mock_service_instance.get_review_context.return_value = {
-            "changes": [
-                {"filePath": "a.py", "action": "DELETE", "proposed_content": ""},
-                {"filePath": "b.py", "action": "REPLACE", "proposed_content": "old content"},
-                {"filePath": "c.py", "action": "CREATE", "proposed_content": "new content"},
-            ]
-        }
-        mock_service_instance.apply_changes.return_value = [{"status": "SUCCESS"}, {"status": "SUCCESS"}]
-
-        revert.run(args)
-
-        mock_launch.assert_not_called()
-        mock_service_instance.apply_changes.assert_called_once()
-
-        # Verify only two files were reverted
-        call_args = mock_service_instance.apply_changes.call_args[0][0]
-        assert len(call_args) == 2
-        assert call_args[0]["filePath"] == "a.py"
-        assert call_args[1]["filePath"] == "b.py"
-
-        captured = capsys.readouterr()
-        assert "Reverting changes for 2 file(s) across all sessions..." in captured.out
-        assert "Reverting 2 change(s)..." in captured.out
+    revert_mocks.service.apply_changes.return_value = [{"status": "SUCCESS"}] * len(reverted)
 
+    revert.run(args)
 
-def test_revert_run_with_files_not_found(sample_project, aicodec_config_file, setup_revert_file, monkeypatch, capsys):
-    """Test revert command with --files flag when specified file is not in revert data."""
-    monkeypatch.chdir(sample_project)
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=False, files=["nonexistent.py"])
-
-    with patch("aicodec.infrastructure.cli.commands.revert.ReviewService") as mock_review_service_class:
-
-        mock_service_instance = mock_review_service_class.return_value
-        mock_service_instance.get_review_context.return_value = {
-            "changes": [{"filePath": "a.py", "action": "DELETE", "content": ""}]
-        }
-
-        revert.run(args)
+    assert revert_mocks.launches == []
+    revert_mocks.service.apply_changes.assert_called_once()
 
-        mock_service_instance.apply_changes.assert_not_called()
+    # Verify only the requested files were reverted
+    call_args = revert_mocks.service.apply_changes.call_args[0][0]
+    assert [c["filePath"] for c in call_args] == reverted
 
-        captured = capsys.readouterr()
-        # The new behavior says "No matching changes in revert-XXX.json"
-        assert "No matching changes in revert-001.json" in captured.out
+    assert_in_order(capsys.readouterr().out, (
+        f"Reverting changes for {len(files)} file(s) across all sessions...",
+        f"Reverting {len(reverted)} change(s)...",
+        "Revert complete",
+    ))
 
 
-def test_revert_run_with_files_partial_match(
-    sample_project, aicodec_config_file, setup_revert_file, monkeypatch, capsys
+def test_revert_run_with_files_not_found(
+    sample_project, aicodec_config_file, setup_revert_file, revert_mocks, capsys
 ):
-    """Test revert command with --files flag when some files are found and some are not."""
-    monkeypatch.chdir(sample_project)
-
-    # Update revert file to have multiple files
-    revert_data = {"summary": "revert data", "changes": [{"filePath": "a.py", "action": "DELETE", "content": ""}]}
-    setup_revert_file.write_text(json.dumps(revert_data))
-
-    args = Namespace(config=str(aicodec_config_file), output_dir=None, all=False, files=["a.py", "nonexistent.py"])
-
-    with patch("aicodec.infrastructure.cli.commands.revert.ReviewService") as mock_review_service_class:
-
-        mock_service_instance = mock_review_service_class.return_value
-        mock_service_instance.get_review_context.return_value = {
-            "changes": [{"filePath": "a.py", "action": "DELETE", "proposed_content": ""}]
-        }
-        mock_service_instance.apply_changes.return_value = [{"status": "SUCCESS"}]
+    """Test revert command with --files flag when specified file is not in revert data."""
+    args = make_revert_args(aicodec_config_file, files=["nonexistent.py"])
+    revert_mocks.service.get_review_context.return_value = {
+        "changes": [{"filePath": "a.py", "action": "DELETE", "content": ""}]
+    }
 
-        revert.run(args)
+    revert.run(args)
 
-        # Verify only one file was reverted
-        call_args = mock_service_instance.apply_changes.call_args[0][0]
-        assert len(call_args) == 1
-        assert call_args[0]["filePath"] == "a.py"
+    revert_mocks.service.apply_changes.assert_not_called()
 
-        captured = capsys.readouterr()
-        # The new behavior shows "Reverting 1 change(s)..." for the matched file
-        assert "Reverting 1 change(s)..." in captured.out
-        assert "Revert complete" in captured.out
+    # The new behavior says "No matching changes in revert-XXX.json"
+    assert "No matching changes in revert-001.json" in capsys.readouterr().out
@@ -1,35 +1,46 @@
 # tests/commands/test_schema.py
+import io
 import json
-from unittest.mock import MagicMock, patch
+from contextlib import redirect_stdout
 
 import pytest
 
 from aicodec.infrastructure.cli.commands import schema
 
 
-def test_schema_run_prints_json(capsys):
+@pytest.fixture(scope="module")
+def schema_output():
+    """The schema command's stdout, captured and parsed once for every test that inspects it."""
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        schema.run(None)
+    return json.loads(stdout.getvalue())
+
+
+def test_schema_run_prints_json(schema_output):
     """Tests that the schema command prints a valid JSON object."""
-    schema.run(None)
-    captured = capsys.readouterr()
+    assert isinstance(schema_output, dict)
+    assert "$schema" in schema_output
+    assert "title" in schema_output
+
+
+class _MissingResource:
+    """Stands in for an importlib.resources Traversable whose files have all gone missing."""
 
-    # Check that it's valid JSON
-    schema_data = json.loads(captured.out)
-    assert isinstance(schema_data, dict)
-    assert "$schema" in schema_data
-    assert "title" in schema_data
+    def __truediv__(self, _child):
+        return self
 
+    def read_text(self, *args, **kwargs):
+        raise FileNotFoundError
 
-def test_schema_run_file_not_found(capsys):
+
+def test_schema_run_file_not_found(monkeypatch, capsys):
     """Tests error handling when the schema file is missing."""
-    with patch('aicodec.infrastructure.cli.commands.schema.files') as mock_files:
-        mock_path = MagicMock()
-        mock_path.read_text.side_effect = FileNotFoundError
-        # This is a bit complex to mock the `files() / "assets" / "file.json"` pattern
-        mock_files.return_value.__truediv__.return_value.__truediv__.return_value = mock_path
-
-        with pytest.raises(SystemExit) as e:
-            schema.run(None)
-
-        assert e.value.code == 1
-        captured = capsys.readouterr()
-        assert "Error: decoder_schema.json not found" in captured.err
+    monkeypatch.setattr('aicodec.infrastructure.cli.commands.schema.files', lambda _package: _MissingResource())
+
+    with pytest.raises(SystemExit) as e:
+        schema.run(None)
+
+    assert e.value.code == 1
+    captured = capsys.readouterr()
+    assert "Error: decoder_schema.json not found" in captured.err
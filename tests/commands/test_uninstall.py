@@ -1,49 +1,49 @@
 # tests/commands/test_uninstall.py
 from argparse import Namespace
-from unittest.mock import patch
+from unittest.mock import DEFAULT, patch
 
 import pytest
 
 from aicodec.infrastructure.cli.commands import uninstall
 
+UNINSTALL_MODULE = "aicodec.infrastructure.cli.commands.uninstall"
+
+# `uninstall.run` only reads `args.force`, so every test can share these
+CONFIRM_ARGS = Namespace(force=False)
+FORCE_ARGS = Namespace(force=True)
+
 
 class TestUninstallScript:
     """Test uninstall script creation."""
 
-    def test_create_uninstall_script_unix_with_sudo(self, tmp_path):
+    def test_create_uninstall_script_unix_with_sudo(self, monkeypatch, dummy_binary, tmp_path):
         """Test creation of Unix uninstall script with sudo."""
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-
-        with patch("platform.system", return_value="Linux"):
-            script_path = uninstall.create_uninstall_script(
-                binary_path=binary_path,
-                install_dir=tmp_path,
-                symlink_path=None,
-                needs_sudo=True,
-                sudo_available=True
-            )
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        script_path = uninstall.create_uninstall_script(
+            binary_path=dummy_binary,
+            install_dir=tmp_path,
+            symlink_path=None,
+            needs_sudo=True,
+            sudo_available=True
+        )
 
         assert script_path.exists()
         assert script_path.name == "uninstall_helper.sh"
         content = script_path.read_text()
         assert "sudo rm -f" in content
-        assert str(binary_path) in content
+        assert str(dummy_binary) in content
         assert "aicodec has been uninstalled successfully" in content
 
-    def test_create_uninstall_script_unix_without_sudo(self, tmp_path):
+    def test_create_uninstall_script_unix_without_sudo(self, monkeypatch, dummy_binary, tmp_path):
         """Test creation of Unix uninstall script without sudo."""
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-
-        with patch("platform.system", return_value="Linux"):
-            script_path = uninstall.create_uninstall_script(
-                binary_path=binary_path,
-                install_dir=tmp_path,
-                symlink_path=None,
-                needs_sudo=False,
-                sudo_available=False
-            )
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        script_path = uninstall.create_uninstall_script(
+            binary_path=dummy_binary,
+            install_dir=tmp_path,
+            symlink_path=None,
+            needs_sudo=False,
+            sudo_available=False
+        )
 
         assert script_path.exists()
         content = script_path.read_text()
@@ -51,42 +51,38 @@ class TestUninstallScript:
         assert "sudo rm" not in content
         assert "rm -f" in content
 
-    def test_create_uninstall_script_unix_with_symlink(self, tmp_path):
+    def test_create_uninstall_script_unix_with_symlink(self, monkeypatch, symlinked_binary, tmp_path):
         """Test creation of Unix uninstall script with symlink removal."""
-        binary_path = tmp_path / "opt" / "aicodec"
-        binary_path.parent.mkdir(parents=True)
-        binary_path.write_text("dummy")
-        symlink_path = tmp_path / "bin" / "aicodec"
-        symlink_path.parent.mkdir(parents=True)
-        symlink_path.symlink_to(binary_path)
-
-        with patch("platform.system", return_value="Linux"):
-            script_path = uninstall.create_uninstall_script(
-                binary_path=binary_path,
-                install_dir=binary_path.parent,
-                symlink_path=symlink_path,
-                needs_sudo=False,
-                sudo_available=False
-            )
+        binary_path, symlink_path = symlinked_binary
+
+        # The helper script is written into install_dir, so keep it out of the shared fixture tree
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        script_path = uninstall.create_uninstall_script(
+            binary_path=binary_path,
+            install_dir=tmp_path,
+            symlink_path=symlink_path,
+            needs_sudo=False,
+            sudo_available=False
+        )
 
         assert script_path.exists()
         content = script_path.read_text()
         assert str(symlink_path) in content
         assert "Remove symlink if it exists" in content
 
-    def test_create_uninstall_script_windows(self, tmp_path):
+    def test_create_uninstall_script_windows(self, monkeypatch, tmp_path):
         """Test creation of Windows uninstall script."""
         binary_path = tmp_path / "aicodec.exe"
-        binary_path.write_text("dummy")
+        binary_path.touch()
 
-        with patch("platform.system", return_value="Windows"):
-            script_path = uninstall.create_uninstall_script(
-                binary_path=binary_path,
-                install_dir=tmp_path,
-                symlink_path=None,
-                needs_sudo=False,
-                sudo_available=False
-            )
+        monkeypatch.setattr("platform.system", lambda: "Windows")
+        script_path = uninstall.create_uninstall_script(
+            binary_path=binary_path,
+            install_dir=tmp_path,
+            symlink_path=None,
+            needs_sudo=False,
+            sudo_available=False
+        )
 
         assert script_path.exists()
         assert script_path.name == "uninstall_helper.ps1"
@@ -109,48 +105,41 @@ class TestPerformUninstall:
         captured = capsys.readouterr()
         assert "Could not find aicodec binary" in captured.err
 
-    @patch("time.sleep")
-    @patch("subprocess.Popen")
-    @patch("aicodec.infrastructure.cli.commands.uninstall.create_uninstall_script")
-    @patch("aicodec.infrastructure.cli.commands.uninstall.can_write_to_path")
-    @patch("aicodec.infrastructure.cli.commands.uninstall.is_sudo_available")
-    @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
-    @patch("platform.system")
-    def test_perform_uninstall_success_linux(
-        self, mock_system, mock_get_path, mock_sudo_available,
-        mock_can_write, mock_create_script, mock_popen, mock_sleep, tmp_path
-    ):
+    def test_perform_uninstall_success_linux(self, monkeypatch, dummy_binary, tmp_path):
         """Test successful uninstall on Linux."""
-        mock_system.return_value = "Linux"
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-        mock_get_path.return_value = (binary_path, None)
-        mock_can_write.return_value = True
-        mock_sudo_available.return_value = False
-        mock_create_script.return_value = tmp_path / "uninstall_helper.sh"
-
-        result = uninstall.perform_uninstall()
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        with (
+            patch.multiple(
+                UNINSTALL_MODULE,
+                get_running_binary_path=DEFAULT, is_sudo_available=DEFAULT,
+                can_write_to_path=DEFAULT, create_uninstall_script=DEFAULT,
+            ) as mocks,
+            patch("subprocess.Popen") as mock_popen,
+            patch("time.sleep") as mock_sleep,
+        ):
+            mocks["get_running_binary_path"].return_value = (dummy_binary, None)
+            mocks["can_write_to_path"].return_value = True
+            mocks["is_sudo_available"].return_value = False
+            mocks["create_uninstall_script"].return_value = tmp_path / "uninstall_helper.sh"
+
+            result = uninstall.perform_uninstall()
 
         assert result is True
         assert mock_popen.called
         assert mock_sleep.called
 
-    @patch("aicodec.infrastructure.cli.commands.uninstall.can_write_to_path")
-    @patch("aicodec.infrastructure.cli.commands.uninstall.is_sudo_available")
-    @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
-    @patch("platform.system")
-    def test_perform_uninstall_no_permissions(
-        self, mock_system, mock_get_path, mock_sudo_available, mock_can_write, tmp_path, capsys
-    ):
+    def test_perform_uninstall_no_permissions(self, monkeypatch, dummy_binary, capsys):
         """Test uninstall failure when no permissions and no sudo."""
-        mock_system.return_value = "Linux"
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-        mock_get_path.return_value = (binary_path, None)
-        mock_can_write.return_value = False
-        mock_sudo_available.return_value = False
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        with patch.multiple(
+            UNINSTALL_MODULE,
+            get_running_binary_path=DEFAULT, is_sudo_available=DEFAULT, can_write_to_path=DEFAULT,
+        ) as mocks:
+            mocks["get_running_binary_path"].return_value = (dummy_binary, None)
+            mocks["can_write_to_path"].return_value = False
+            mocks["is_sudo_available"].return_value = False
 
-        result = uninstall.perform_uninstall()
+            result = uninstall.perform_uninstall()
 
         assert result is False
         captured = capsys.readouterr()
@@ -164,10 +153,9 @@ class TestUninstallCommand:
     def test_run_not_prebuilt(self, mock_is_prebuilt, capsys):
         """Test error when not running from pre-built binary."""
         mock_is_prebuilt.return_value = False
-        args = Namespace(force=False)
 
         with pytest.raises(SystemExit) as exc_info:
-            uninstall.run(args)
+            uninstall.run(CONFIRM_ARGS)
 
         assert exc_info.value.code == 1
         captured = capsys.readouterr()
@@ -180,10 +168,9 @@ class TestUninstallCommand:
         """Test error when binary cannot be found."""
         mock_is_prebuilt.return_value = True
         mock_get_path.return_value = (None, None)
-        args = Namespace(force=False)
 
         with pytest.raises(SystemExit) as exc_info:
-            uninstall.run(args)
+            uninstall.run(CONFIRM_ARGS)
 
         assert exc_info.value.code == 1
         captured = capsys.readouterr()
@@ -192,17 +179,14 @@ class TestUninstallCommand:
     @patch("builtins.input")
     @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
     @patch("aicodec.infrastructure.cli.commands.uninstall.is_prebuilt_install")
-    def test_run_cancelled_by_user(self, mock_is_prebuilt, mock_get_path, mock_input, tmp_path, capsys):
+    def test_run_cancelled_by_user(self, mock_is_prebuilt, mock_get_path, mock_input, dummy_binary, capsys):
         """Test when user cancels the uninstall."""
         mock_is_prebuilt.return_value = True
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-        mock_get_path.return_value = (binary_path, None)
+        mock_get_path.return_value = (dummy_binary, None)
         mock_input.return_value = "n"
-        args = Namespace(force=False)
 
         with pytest.raises(SystemExit) as exc_info:
-            uninstall.run(args)
+            uninstall.run(CONFIRM_ARGS)
 
         assert exc_info.value.code == 0
         captured = capsys.readouterr()
@@ -213,19 +197,16 @@ class TestUninstallCommand:
     @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
     @patch("aicodec.infrastructure.cli.commands.uninstall.is_prebuilt_install")
     def test_run_successful_uninstall(
-        self, mock_is_prebuilt, mock_get_path, mock_input, mock_perform, tmp_path, capsys
+        self, mock_is_prebuilt, mock_get_path, mock_input, mock_perform, dummy_binary
     ):
         """Test successful uninstall process."""
         mock_is_prebuilt.return_value = True
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-        mock_get_path.return_value = (binary_path, None)
+        mock_get_path.return_value = (dummy_binary, None)
         mock_input.return_value = "y"
         mock_perform.return_value = True
-        args = Namespace(force=False)
 
         with pytest.raises(SystemExit) as exc_info:
-            uninstall.run(args)
+            uninstall.run(CONFIRM_ARGS)
 
         assert exc_info.value.code == 0
 
@@ -233,19 +214,16 @@ class TestUninstallCommand:
     @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
     @patch("aicodec.infrastructure.cli.commands.uninstall.is_prebuilt_install")
     def test_run_force_flag_skips_confirmation(
-        self, mock_is_prebuilt, mock_get_path, mock_perform, tmp_path
+        self, mock_is_prebuilt, mock_get_path, mock_perform, dummy_binary
     ):
         """Test that --force flag skips confirmation prompt."""
         mock_is_prebuilt.return_value = True
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-        mock_get_path.return_value = (binary_path, None)
+        mock_get_path.return_value = (dummy_binary, None)
         mock_perform.return_value = True
-        args = Namespace(force=True)
 
         # Should not ask for input with --force
         with pytest.raises(SystemExit) as exc_info:
-            uninstall.run(args)
+            uninstall.run(FORCE_ARGS)
 
         assert exc_info.value.code == 0
         # perform_uninstall should be called without any input prompt
@@ -256,19 +234,16 @@ class TestUninstallCommand:
     @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
     @patch("aicodec.infrastructure.cli.commands.uninstall.is_prebuilt_install")
     def test_run_uninstall_failed(
-        self, mock_is_prebuilt, mock_get_path, mock_input, mock_perform, tmp_path, capsys
+        self, mock_is_prebuilt, mock_get_path, mock_input, mock_perform, dummy_binary, capsys
     ):
         """Test when uninstall fails."""
         mock_is_prebuilt.return_value = True
-        binary_path = tmp_path / "aicodec"
-        binary_path.write_text("dummy")
-        mock_get_path.return_value = (binary_path, None)
+        mock_get_path.return_value = (dummy_binary, None)
         mock_input.return_value = "y"
         mock_perform.return_value = False
-        args = Namespace(force=False)
 
         with pytest.raises(SystemExit) as exc_info:
-            uninstall.run(args)
+            uninstall.run(CONFIRM_ARGS)
 
         assert exc_info.value.code == 1
         captured = capsys.readouterr()
@@ -278,22 +253,16 @@ class TestUninstallCommand:
     @patch("aicodec.infrastructure.cli.commands.uninstall.get_running_binary_path")
     @patch("aicodec.infrastructure.cli.commands.uninstall.is_prebuilt_install")
     def test_run_shows_symlink_in_removal_list(
-        self, mock_is_prebuilt, mock_get_path, mock_input, tmp_path, capsys
+        self, mock_is_prebuilt, mock_get_path, mock_input, symlinked_binary, capsys
     ):
         """Test that symlink is shown in the removal list when applicable."""
         mock_is_prebuilt.return_value = True
-        binary_path = tmp_path / "real" / "aicodec"
-        binary_path.parent.mkdir(parents=True)
-        binary_path.write_text("dummy")
-        symlink_path = tmp_path / "bin" / "aicodec"
-        symlink_path.parent.mkdir(parents=True)
-        symlink_path.symlink_to(binary_path)
+        binary_path, symlink_path = symlinked_binary
         mock_get_path.return_value = (binary_path, symlink_path)
         mock_input.return_value = "n"  # Cancel to avoid needing more mocks
-        args = Namespace(force=False)
 
         with pytest.raises(SystemExit):
-            uninstall.run(args)
+            uninstall.run(CONFIRM_ARGS)
 
         captured = capsys.readouterr()
         assert "Symlink:" in captured.out
@@ -1,267 +1,238 @@
 # tests/commands/test_update.py
+import io
 import json
+import os
+import zipfile
 from argparse import Namespace
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 from aicodec.infrastructure.cli.commands import update
 
 
-class TestVersionComparison:
-    """Test version comparison logic."""
-
-    def test_compare_versions_older(self):
-        assert update.compare_versions("2.9.0", "2.10.0") == -1
-        assert update.compare_versions("1.5.3", "2.0.0") == -1
-        assert update.compare_versions("2.9.9", "2.10.0") == -1
-
-    def test_compare_versions_equal(self):
-        assert update.compare_versions("2.10.0", "2.10.0") == 0
-        assert update.compare_versions("1.0.0", "1.0.0") == 0
-
-    def test_compare_versions_newer(self):
-        assert update.compare_versions("2.11.0", "2.10.0") == 1
-        assert update.compare_versions("3.0.0", "2.10.0") == 1
-        assert update.compare_versions("2.10.1", "2.10.0") == 1
-
-    def test_compare_versions_invalid(self, capsys):
-        """Test handling of invalid version strings."""
-        result = update.compare_versions("invalid", "2.10.0")
-        assert result == 0
-        captured = capsys.readouterr()
-        assert "Could not parse version strings" in captured.err
-
-
-class TestFrozenBinaryDetection:
-    """Test detection of frozen/compiled binary."""
-
-    @patch("sys.executable", "/opt/aicodec/aicodec")
-    def test_is_frozen_binary_nuitka(self):
-        """Test detection of Nuitka compiled binary."""
-        # When sys.executable is 'aicodec' (not python), it's a frozen binary
-        assert update.is_frozen_binary() is True
-
-    @patch("sys.executable", "/usr/bin/python3")
-    def test_is_frozen_binary_pip_install(self):
-        """Test detection of pip installation (not frozen)."""
-        # When sys.executable is python, it's not a frozen binary
-        with patch.object(update.sys, 'frozen', False, create=True):
-            assert update.is_frozen_binary() is False
-
-    @patch("sys.executable", "/usr/bin/python3")
-    def test_is_frozen_binary_pyinstaller(self):
-        """Test detection of PyInstaller binary via sys.frozen."""
-        with patch.object(update.sys, 'frozen', True, create=True):
-            assert update.is_frozen_binary() is True
+@pytest.fixture(autouse=True)
+def _isolated_cache_home(tmp_path, monkeypatch):
+    """Keep the latest-version cache out of the real user cache, and empty for every test."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize("current, latest, expected", [
+    ("2.9.0", "2.10.0", -1),
+    ("1.5.3", "2.0.0", -1),
+    ("2.9.9", "2.10.0", -1),
+    ("2.10.0", "2.10.0", 0),
+    ("1.0.0", "1.0.0", 0),
+    ("2.11.0", "2.10.0", 1),
+    ("3.0.0", "2.10.0", 1),
+    ("2.10.1", "2.10.0", 1),
+])
+def test_compare_versions(current, latest, expected):
+    assert update.compare_versions(current, latest) == expected
+
+
+def test_compare_versions_invalid(capsys):
+    """Test handling of invalid version strings."""
+    result = update.compare_versions("invalid", "2.10.0")
+    assert result == 0
+    captured = capsys.readouterr()
+    assert "Could not parse version strings" in captured.err
+
+
+@pytest.mark.parametrize("executable, frozen, expected", [
+    # When sys.executable is 'aicodec' (not python), it's a Nuitka compiled binary
+    ("/opt/aicodec/aicodec", False, True),
+    ("/usr/bin/python3", False, False),
+    # PyInstaller sets sys.frozen
+    ("/usr/bin/python3", True, True),
+], ids=["nuitka", "pip-install", "pyinstaller"])
+def test_is_frozen_binary(monkeypatch, executable, frozen, expected):
+    """Test detection of a frozen/compiled binary."""
+    monkeypatch.setattr(update.sys, "executable", executable)
+    monkeypatch.setattr(update.sys, "frozen", frozen, raising=False)
+    assert update.is_frozen_binary() is expected
 
 
 class TestRunningBinaryPathDetection:
     """Test detection of the running binary path."""
 
-    @patch("shutil.which")
-    @patch("platform.system")
-    def test_get_running_binary_path_found_in_path(self, mock_system, mock_which, tmp_path):
+    def test_get_running_binary_path_found_in_path(self, monkeypatch, dummy_binary):
         """Test detection when binary is found in PATH."""
-        mock_system.return_value = "Linux"
-        binary = tmp_path / "aicodec"
-        binary.write_text("dummy")
-        mock_which.return_value = str(binary)
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        monkeypatch.setattr("shutil.which", lambda _name: str(dummy_binary))
 
         real_path, symlink_path = update.get_running_binary_path()
-        assert real_path == binary.resolve()
+        assert real_path == dummy_binary.resolve()
         assert symlink_path is None
 
-    @patch("shutil.which")
-    @patch("platform.system")
-    def test_get_running_binary_path_via_symlink(self, mock_system, mock_which, tmp_path):
+    def test_get_running_binary_path_via_symlink(self, monkeypatch, symlinked_binary):
         """Test detection when binary is accessed via symlink."""
-        mock_system.return_value = "Linux"
-        # Create a real binary
-        real_binary = tmp_path / "real" / "aicodec"
-        real_binary.parent.mkdir(parents=True)
-        real_binary.write_text("dummy")
-        # Create a symlink to it
-        symlink = tmp_path / "bin" / "aicodec"
-        symlink.parent.mkdir(parents=True)
-        symlink.symlink_to(real_binary)
-
-        mock_which.return_value = str(symlink)
+        real_binary, symlink = symlinked_binary
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        monkeypatch.setattr("shutil.which", lambda _name: str(symlink))
 
         real_path, symlink_path = update.get_running_binary_path()
         assert real_path == real_binary.resolve()
         assert symlink_path == symlink
 
-    @patch("shutil.which")
-    @patch("platform.system")
-    @patch("pathlib.Path.exists")
-    def test_get_running_binary_path_fallback_to_default(self, mock_exists, mock_system, mock_which):
-        """Test fallback to default path when not found in PATH."""
-        mock_system.return_value = "Linux"
-        mock_which.return_value = None
-        mock_exists.return_value = True
+    def test_get_running_binary_path_cached(self, monkeypatch, record_calls, dummy_binary):
+        """Test the PATH lookup happens once per process."""
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        lookups = record_calls("shutil.which", return_value=str(dummy_binary))
 
-        real_path, symlink_path = update.get_running_binary_path()
-        # Should return the default /opt/aicodec/aicodec path
-        assert real_path is not None
-        assert symlink_path is None
+        assert update.get_running_binary_path() == update.get_running_binary_path()
+        assert len(lookups) == 1
 
-    @patch("shutil.which")
-    @patch("platform.system")
-    @patch("pathlib.Path.exists")
-    def test_get_running_binary_path_not_found(self, mock_exists, mock_system, mock_which):
-        """Test when binary is not found anywhere."""
-        mock_system.return_value = "Linux"
-        mock_which.return_value = None
-        mock_exists.return_value = False
+    @pytest.mark.parametrize("installed", [True, False], ids=["fallback-to-default", "not-found"])
+    def test_get_running_binary_path_not_in_path(self, monkeypatch, dummy_binary, tmp_path, installed):
+        """Test fallback to the default install location when not found in PATH."""
+        default_binary = dummy_binary if installed else tmp_path / "missing" / "aicodec"
+        monkeypatch.setattr("shutil.which", lambda _name: None)
+        monkeypatch.setattr(update, "_default_binary_path", lambda: default_binary)
 
         real_path, symlink_path = update.get_running_binary_path()
-        assert real_path is None
+        assert real_path == (dummy_binary.resolve() if installed else None)
         assert symlink_path is None
 
 
 class TestPrebuiltDetection:
     """Test detection of pre-built installations."""
 
-    @patch("aicodec.infrastructure.cli.commands.update.is_frozen_binary")
-    @patch("platform.system")
-    @patch("pathlib.Path.exists")
-    def test_is_prebuilt_install_true_linux(self, mock_exists, mock_system, mock_frozen):
-        """Test detection when running from pre-built binary on Linux."""
-        mock_frozen.return_value = True
-        mock_system.return_value = "Linux"
-        mock_exists.return_value = True
-        assert update.is_prebuilt_install() is True
-
-    @patch("aicodec.infrastructure.cli.commands.update.is_frozen_binary")
-    @patch("platform.system")
-    @patch("pathlib.Path.exists")
-    def test_is_prebuilt_install_true_windows(self, mock_exists, mock_system, mock_frozen):
-        """Test detection when running from pre-built binary on Windows."""
-        mock_frozen.return_value = True
-        mock_system.return_value = "Windows"
-        mock_exists.return_value = True
-        assert update.is_prebuilt_install() is True
-
-    @patch("aicodec.infrastructure.cli.commands.update.is_frozen_binary")
-    @patch("platform.system")
-    @patch("pathlib.Path.exists")
-    def test_is_prebuilt_install_false_not_frozen(self, mock_exists, mock_system, mock_frozen):
-        """Test detection when running from pip (not frozen binary)."""
-        mock_frozen.return_value = False  # Running from pip
-        mock_system.return_value = "Linux"
-        mock_exists.return_value = True  # Binary exists but we're not running from it
-        assert update.is_prebuilt_install() is False
-
-    @patch("aicodec.infrastructure.cli.commands.update.is_frozen_binary")
-    @patch("platform.system")
-    @patch("pathlib.Path.exists")
-    def test_is_prebuilt_install_false_no_binary(self, mock_exists, mock_system, mock_frozen):
-        """Test detection when pre-built binary doesn't exist."""
-        mock_frozen.return_value = True
-        mock_system.return_value = "Linux"
-        mock_exists.return_value = False
-        assert update.is_prebuilt_install() is False
-
-
-class TestDownloadUrlGeneration:
-    """Test download URL generation for different platforms."""
-
-    @patch("platform.system")
-    @patch("platform.machine")
-    def test_get_download_url_linux_amd64(self, mock_machine, mock_system):
-        mock_system.return_value = "Linux"
-        mock_machine.return_value = "x86_64"
-        url = update.get_download_url()
-        assert url == "https://github.com/Stevie1704/aicodec/releases/latest/download/aicodec-linux-amd64.zip"
-
-    @patch("platform.system")
-    @patch("platform.machine")
-    def test_get_download_url_darwin_arm64(self, mock_machine, mock_system):
-        mock_system.return_value = "Darwin"
-        mock_machine.return_value = "arm64"
-        url = update.get_download_url()
-        assert url == "https://github.com/Stevie1704/aicodec/releases/latest/download/aicodec-darwin-arm64.zip"
-
-    @patch("platform.system")
-    @patch("platform.machine")
-    def test_get_download_url_linux_arm64(self, mock_machine, mock_system):
-        mock_system.return_value = "Linux"
-        mock_machine.return_value = "aarch64"
-        url = update.get_download_url()
-        assert url == "https://github.com/Stevie1704/aicodec/releases/latest/download/aicodec-linux-arm64.zip"
-
-    @patch("platform.system")
-    @patch("platform.machine")
-    def test_get_download_url_windows_amd64(self, mock_machine, mock_system):
-        mock_system.return_value = "Windows"
-        mock_machine.return_value = "x86_64"
-        url = update.get_download_url()
-        assert url == "https://github.com/Stevie1704/aicodec/releases/latest/download/aicodec-windows-amd64.zip"
-
-    @patch("platform.system")
-    @patch("platform.machine")
-    def test_get_download_url_unsupported_os(self, mock_machine, mock_system, capsys):
-        mock_system.return_value = "FreeBSD"
-        mock_machine.return_value = "x86_64"
-        url = update.get_download_url()
-        assert url is None
-        captured = capsys.readouterr()
-        assert "Unsupported OS" in captured.err
-
-    @patch("platform.system")
-    @patch("platform.machine")
-    def test_get_download_url_unsupported_arch(self, mock_machine, mock_system, capsys):
-        mock_system.return_value = "Linux"
-        mock_machine.return_value = "i386"
-        url = update.get_download_url()
-        assert url is None
-        captured = capsys.readouterr()
-        assert "Unsupported architecture" in captured.err
+    @pytest.mark.parametrize("frozen, installed, expected", [
+        (True, True, True),
+        (False, True, False),  # Binary exists but we're running from pip
+        (True, False, False),
+    ], ids=["prebuilt", "not-frozen", "no-binary"])
+    def test_is_prebuilt_install(self, monkeypatch, dummy_binary, tmp_path, frozen, installed, expected):
+        """Test a pre-built install needs both a frozen binary and the binary in its install location."""
+        default_binary = dummy_binary if installed else tmp_path / "missing" / "aicodec"
+        monkeypatch.setattr(update, "is_frozen_binary", lambda: frozen)
+        monkeypatch.setattr(update, "_default_binary_path", lambda: default_binary)
+        assert update.is_prebuilt_install() is expected
+
+    @pytest.mark.parametrize("system, expected", [
+        ("Linux", Path("/opt/aicodec/aicodec")),
+        ("Darwin", Path("/opt/aicodec/aicodec")),
+        ("Windows", Path.home() / "aicodec" / "aicodec.exe"),
+    ])
+    def test_default_binary_path(self, monkeypatch, system, expected):
+        """Test the default install location the install scripts use on each platform."""
+        monkeypatch.setattr("platform.system", lambda: system)
+        assert update._default_binary_path() == expected
+
+
+_RELEASE_URL = "https://github.com/Stevie1704/aicodec/releases/latest/download/"
+
+
+@pytest.mark.parametrize("system, machine, expected_url, expected_err", [
+    ("Linux", "x86_64", _RELEASE_URL + "aicodec-linux-amd64.zip", None),
+    ("Darwin", "arm64", _RELEASE_URL + "aicodec-darwin-arm64.zip", None),
+    ("Linux", "aarch64", _RELEASE_URL + "aicodec-linux-arm64.zip", None),
+    ("Windows", "x86_64", _RELEASE_URL + "aicodec-windows-amd64.zip", None),
+    ("FreeBSD", "x86_64", None, "Unsupported OS"),
+    ("Linux", "i386", None, "Unsupported architecture"),
+], ids=["linux-amd64", "darwin-arm64", "linux-arm64", "windows-amd64", "unsupported-os", "unsupported-arch"])
+def test_get_download_url(monkeypatch, capsys, system, machine, expected_url, expected_err):
+    """Test download URL generation for each supported platform, and the error for unsupported ones."""
+    monkeypatch.setattr(update.platform, "system", lambda: system)
+    monkeypatch.setattr(update.platform, "machine", lambda: machine)
+
+    assert update.get_download_url() == expected_url
+    if expected_err:
+        assert expected_err in capsys.readouterr().err
+
+
+# GitHub "latest release" response bodies
+_RESP_WITH_V = b'{"tag_name": "v2.10.0"}'
+_RESP_NO_V = b'{"tag_name": "2.10.0"}'
+_RESP_BAD = b"invalid json"
+
+
+class _FakeResponse:
+    """Just enough of an HTTP response for `get_latest_version`: a context manager with `read()`."""
+
+    def __init__(self, body):
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        return False
+
+    def read(self):
+        return self._body
+
+
+def _fake_urlopen(body):
+    """Returns a `urlopen` replacement that answers every request with `body`."""
+    return lambda _url, **_kwargs: _FakeResponse(body)
 
 
 class TestGetLatestVersion:
     """Test fetching latest version from GitHub."""
 
-    @patch("urllib.request.urlopen")
-    def test_get_latest_version_success(self, mock_urlopen):
+    def test_get_latest_version_success(self, monkeypatch):
         """Test successful fetch of latest version."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({"tag_name": "v2.10.0"}).encode()
-        mock_response.__enter__.return_value = mock_response
-        mock_urlopen.return_value = mock_response
+        monkeypatch.setattr("urllib.request.urlopen", _fake_urlopen(_RESP_WITH_V))
 
         version = update.get_latest_version()
         assert version == "2.10.0"
 
-    @patch("urllib.request.urlopen")
-    def test_get_latest_version_without_v_prefix(self, mock_urlopen):
+    def test_get_latest_version_without_v_prefix(self, monkeypatch):
         """Test version without 'v' prefix."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({"tag_name": "2.10.0"}).encode()
-        mock_response.__enter__.return_value = mock_response
-        mock_urlopen.return_value = mock_response
+        monkeypatch.setattr("urllib.request.urlopen", _fake_urlopen(_RESP_NO_V))
 
         version = update.get_latest_version()
         assert version == "2.10.0"
 
-    @patch("urllib.request.urlopen")
-    def test_get_latest_version_network_error(self, mock_urlopen, capsys):
+    def test_get_latest_version_cached(self, monkeypatch, record_calls):
+        """Test a second lookup within the TTL is answered from the cache without another request."""
+        requests = record_calls("urllib.request.urlopen", return_value=_FakeResponse(_RESP_WITH_V))
+
+        assert update.get_latest_version() == "2.10.0"
+        assert update.get_latest_version() == "2.10.0"
+        assert len(requests) == 1
+
+        # Once the TTL has passed, GitHub is asked again
+        now = update.time.time()
+        monkeypatch.setattr("time.time", lambda: now + update.LATEST_VERSION_TTL_SECONDS)
+        assert update.get_latest_version() == "2.10.0"
+        assert len(requests) == 2
+
+    @pytest.mark.parametrize("cached", [
+        {"url": update.LATEST_RELEASE_URL, "fetched_at": 999_990, "tag_name": 210},
+        {"url": update.LATEST_RELEASE_URL, "fetched_at": 999_990, "tag_name": ""},
+        {"url": update.LATEST_RELEASE_URL, "fetched_at": 999_990},
+        {"url": update.LATEST_RELEASE_URL, "fetched_at": 1_003_600, "tag_name": "v9.9.9"},
+        ["v9.9.9"],
+    ])
+    def test_get_latest_version_ignores_unusable_cache(self, monkeypatch, cached):
+        """Test a malformed or future-dated cache entry is refetched rather than trusted."""
+        cache_file = update._latest_version_cache_file()
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text(json.dumps(cached))
+        monkeypatch.setattr("time.time", lambda: 1_000_000)
+        monkeypatch.setattr("urllib.request.urlopen", _fake_urlopen(_RESP_WITH_V))
+
+        assert update.get_latest_version() == "2.10.0"
+
+    def test_get_latest_version_network_error(self, monkeypatch, capsys):
         """Test handling of network errors."""
-        mock_urlopen.side_effect = Exception("Network error")
+        def unreachable(_url, **_kwargs):
+            raise Exception("Network error")
+
+        monkeypatch.setattr("urllib.request.urlopen", unreachable)
 
         version = update.get_latest_version()
         assert version is None
         captured = capsys.readouterr()
         assert "Error fetching latest version" in captured.err
 
-    @patch("urllib.request.urlopen")
-    def test_get_latest_version_invalid_json(self, mock_urlopen, capsys):
+    def test_get_latest_version_invalid_json(self, monkeypatch, capsys):
         """Test handling of invalid JSON response."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = b"invalid json"
-        mock_response.__enter__.return_value = mock_response
-        mock_urlopen.return_value = mock_response
+        monkeypatch.setattr("urllib.request.urlopen", _fake_urlopen(_RESP_BAD))
 
         version = update.get_latest_version()
         assert version is None
@@ -269,110 +240,87 @@ class TestGetLatestVersion:
         assert "Error fetching latest version" in captured.err
 
 
+@pytest.fixture
+def release_download(tmp_path, monkeypatch, record_calls):
+    """Points `update_binary` at a real binary under tmp_path and serves it a real release zip.
+
+    Only the network, the installer launch and the final sleep are stubbed; tests set the permission checks.
+    Returns both binary paths and the recorded `subprocess.Popen` and `time.sleep` calls.
+    """
+    installed_binary = tmp_path / "aicodec"
+    installed_binary.write_bytes(b"old_binary")
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as release:
+        release.writestr("aicodec", b"binary_content")
+
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+    monkeypatch.setattr(update, "get_running_binary_path", lambda: (installed_binary, None))
+    monkeypatch.setattr(update, "get_download_url", lambda: "https://example.com/aicodec.zip")
+    monkeypatch.setattr("urllib.request.urlopen", _fake_urlopen(archive.getvalue()))
+    return SimpleNamespace(
+        installed_binary=installed_binary,
+        new_binary=tmp_path / "aicodec.new",
+        launches=record_calls("subprocess.Popen"),
+        sleeps=record_calls("time.sleep", return_value=None),
+    )
+
+
 class TestUpdateBinary:
     """Test the actual update process."""
 
-    @patch("aicodec.infrastructure.cli.commands.update.get_download_url")
-    def test_update_binary_no_url(self, mock_get_url):
+    def test_update_binary_no_url(self, monkeypatch):
         """Test handling when download URL cannot be determined."""
-        mock_get_url.return_value = None
+        monkeypatch.setattr(update, "get_download_url", lambda: None)
         result = update.update_binary()
         assert result is False
 
-    @patch("time.sleep")
-    @patch("subprocess.Popen")
-    @patch("builtins.open", new_callable=MagicMock)
-    @patch("zipfile.ZipFile")
-    @patch("urllib.request.urlretrieve")
-    @patch("aicodec.infrastructure.cli.commands.update.get_download_url")
-    @patch("aicodec.infrastructure.cli.commands.update.is_sudo_available")
-    @patch("aicodec.infrastructure.cli.commands.update.can_write_to_path")
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.unlink")
-    @patch("pathlib.Path.write_text")
-    @patch("os.chmod")
-    def test_update_binary_success(
-        self, mock_chmod, mock_write_text, mock_unlink, mock_exists, mock_can_write,
-        mock_sudo_available, mock_get_url, mock_retrieve, mock_zipfile, mock_open,
-        mock_popen, mock_sleep
-    ):
-        """Test successful update process with helper script."""
-        mock_get_url.return_value = "https://example.com/aicodec.zip"
-        mock_exists.return_value = True  # Simulate that the new binary was extracted
-        mock_sudo_available.return_value = True  # Sudo is available
-        mock_can_write.return_value = False  # Need sudo for write
-
-        # Mock the zip file extraction
-        mock_zip = MagicMock()
-        mock_zip.namelist.return_value = ["aicodec"]
-        mock_zip.open.return_value.__enter__.return_value.read.return_value = b"binary_content"
-        mock_zipfile.return_value.__enter__.return_value = mock_zip
-
-        # Mock file open for writing binary
-        mock_file = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file
-
-        mock_popen.return_value = MagicMock()
+    def test_update_binary_with_sudo(self, release_download, monkeypatch):
+        """Test a root-owned install is left to the helper script, which runs after we exit."""
+        monkeypatch.setattr(update, "can_write_to_path", lambda _path: False)  # Need sudo for write
+        monkeypatch.setattr(update, "is_sudo_available", lambda: True)
 
         result = update.update_binary()
         assert result is True
 
-        # Verify Popen was called to launch the helper script
-        assert mock_popen.called
-        # Verify sleep was called (waiting before exit)
-        assert mock_sleep.called
-
-    @patch("time.sleep")
-    @patch("subprocess.Popen")
-    @patch("builtins.open", new_callable=MagicMock)
-    @patch("zipfile.ZipFile")
-    @patch("urllib.request.urlretrieve")
-    @patch("aicodec.infrastructure.cli.commands.update.get_download_url")
-    @patch("aicodec.infrastructure.cli.commands.update.is_sudo_available")
-    @patch("aicodec.infrastructure.cli.commands.update.can_write_to_path")
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.unlink")
-    @patch("pathlib.Path.write_text")
-    @patch("os.chmod")
-    def test_update_binary_no_sudo_but_has_write_permission(
-        self, mock_chmod, mock_write_text, mock_unlink, mock_exists, mock_can_write,
-        mock_sudo_available, mock_get_url, mock_retrieve, mock_zipfile, mock_open,
-        mock_popen, mock_sleep
-    ):
-        """Test successful update in devcontainer (no sudo but has write permissions)."""
-        mock_get_url.return_value = "https://example.com/aicodec.zip"
-        mock_exists.return_value = True
-        mock_sudo_available.return_value = False  # No sudo available (devcontainer)
-        mock_can_write.return_value = True  # But has write permissions
-
-        # Mock the zip file extraction
-        mock_zip = MagicMock()
-        mock_zip.namelist.return_value = ["aicodec"]
-        mock_zip.open.return_value.__enter__.return_value.read.return_value = b"binary_content"
-        mock_zipfile.return_value.__enter__.return_value = mock_zip
-
-        # Mock file open for writing binary
-        mock_file = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file
-
-        mock_popen.return_value = MagicMock()
+        assert release_download.new_binary.read_bytes() == b"binary_content"
+        assert release_download.installed_binary.read_bytes() == b"old_binary"
+        # The helper script was launched, then we waited before exiting
+        assert len(release_download.launches) == 1
+        assert len(release_download.sleeps) == 1
+
+        # The move and chmod share one privileged process
+        script = (release_download.new_binary.parent / "update_helper.sh").read_text()
+        sudo_lines = [line for line in script.splitlines() if line.startswith("sudo ")]
+        assert len(sudo_lines) == 1
+        assert "mv " in sudo_lines[0] and "chmod +x" in sudo_lines[0]
+
+    @pytest.mark.parametrize("sudo_available", [True, False], ids=["sudo", "no-sudo"])
+    def test_update_binary_writable_install(self, release_download, monkeypatch, sudo_available):
+        """Test a user-writable install (e.g. a devcontainer without sudo) is still swapped by the helper script.
+
+        The helper waits for this process to exit, so the running binary is never replaced under it.
+        """
+        monkeypatch.setattr(update, "can_write_to_path", lambda _path: True)
+        monkeypatch.setattr(update, "is_sudo_available", lambda: sudo_available)
 
         result = update.update_binary()
         assert result is True
 
-        # Verify update succeeded without sudo
-        assert mock_popen.called
+        assert release_download.installed_binary.read_bytes() == b"old_binary"
+        assert release_download.new_binary.read_bytes() == b"binary_content"
+        assert os.access(release_download.new_binary, os.X_OK)
+        assert len(release_download.launches) == 1
+        assert len(release_download.sleeps) == 1
 
-    @patch("aicodec.infrastructure.cli.commands.update.get_download_url")
-    @patch("aicodec.infrastructure.cli.commands.update.is_sudo_available")
-    @patch("aicodec.infrastructure.cli.commands.update.can_write_to_path")
-    def test_update_binary_no_sudo_no_write_permission(
-        self, mock_can_write, mock_sudo_available, mock_get_url, capsys
-    ):
+        # A writable install needs no privileged step in the helper
+        script = (release_download.new_binary.parent / "update_helper.sh").read_text()
+        assert not any(line.startswith("sudo ") for line in script.splitlines())
+
+    def test_update_binary_no_sudo_no_write_permission(self, release_download, monkeypatch, capsys):
         """Test update failure when no sudo and no write permissions."""
-        mock_get_url.return_value = "https://example.com/aicodec.zip"
-        mock_sudo_available.return_value = False  # No sudo
-        mock_can_write.return_value = False  # No write permissions
+        monkeypatch.setattr(update, "is_sudo_available", lambda: False)  # No sudo
+        monkeypatch.setattr(update, "can_write_to_path", lambda _path: False)  # No write permissions
 
         result = update.update_binary()
         assert result is False
@@ -380,141 +328,54 @@ class TestUpdateBinary:
         captured = capsys.readouterr()
         assert "Insufficient permissions" in captured.err
         assert "sudo is not available" in captured.err
-
-
-class TestUpdateCommand:
-    """Test the main update command."""
-
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_not_prebuilt(self, mock_is_prebuilt, capsys):
-        """Test error when not running from pre-built binary (without --check)."""
-        mock_is_prebuilt.return_value = False
-        args = Namespace(check=False)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "only available for pre-built binary installations" in captured.out
-        assert "pip install --upgrade aicodec" in captured.out
-
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_check_with_pip_installation(self, mock_is_prebuilt, mock_get_latest, capsys):
-        """Test --check flag works with pip installations."""
-        mock_is_prebuilt.return_value = False  # Pip installation
-        mock_get_latest.return_value = "99.0.0"  # Higher than any current version
-        args = Namespace(check=True)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 0
-        captured = capsys.readouterr()
-        assert "A new version is available" in captured.out
-        assert "pip install --upgrade aicodec" in captured.out
-        assert "aicodec update" not in captured.out  # Should not suggest binary update for pip
-
-    @patch("aicodec.infrastructure.cli.commands.update.__version__", "2.12.0")
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_already_latest(self, mock_is_prebuilt, mock_get_latest, capsys):
-        """Test when already running latest version."""
-        mock_is_prebuilt.return_value = True
-        mock_get_latest.return_value = "2.12.0"  # Same as mocked current version
-        args = Namespace(check=False)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 0
-        captured = capsys.readouterr()
-        assert "already running the latest version" in captured.out
-
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_check_only(self, mock_is_prebuilt, mock_get_latest, capsys):
-        """Test --check flag (no installation)."""
-        mock_is_prebuilt.return_value = True
-        mock_get_latest.return_value = "99.0.0"  # Higher than any current version
-        args = Namespace(check=True)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 0
-        captured = capsys.readouterr()
-        assert "A new version is available" in captured.out
-        assert "Run 'aicodec update' to install" in captured.out
-
-    @patch("builtins.input")
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_cancelled_by_user(self, mock_is_prebuilt, mock_get_latest, mock_input, capsys):
-        """Test when user cancels the update."""
-        mock_is_prebuilt.return_value = True
-        mock_get_latest.return_value = "99.0.0"  # Higher than any current version
-        mock_input.return_value = "n"
-        args = Namespace(check=False)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 0
-        captured = capsys.readouterr()
-        assert "Update cancelled" in captured.out
-
-    @patch("aicodec.infrastructure.cli.commands.update.update_binary")
-    @patch("builtins.input")
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_successful_update(self, mock_is_prebuilt, mock_get_latest, mock_input, mock_update_binary, capsys):
-        """Test successful update process."""
-        mock_is_prebuilt.return_value = True
-        mock_get_latest.return_value = "99.0.0"  # Higher than any current version
-        mock_input.return_value = "y"
-        mock_update_binary.return_value = True
-        args = Namespace(check=False)
-
-        # Successful update exits so helper script can replace binary
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 0
-        captured = capsys.readouterr()
-        assert "A new version is available" in captured.out
-
-    @patch("aicodec.infrastructure.cli.commands.update.update_binary")
-    @patch("builtins.input")
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_update_failed(self, mock_is_prebuilt, mock_get_latest, mock_input, mock_update_binary, capsys):
-        """Test when update fails."""
-        mock_is_prebuilt.return_value = True
-        mock_get_latest.return_value = "99.0.0"  # Higher than any current version
-        mock_input.return_value = "y"
-        mock_update_binary.return_value = False
-        args = Namespace(check=False)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "Update failed" in captured.out
-
-    @patch("aicodec.infrastructure.cli.commands.update.get_latest_version")
-    @patch("aicodec.infrastructure.cli.commands.update.is_prebuilt_install")
-    def test_run_cannot_check_updates(self, mock_is_prebuilt, mock_get_latest, capsys):
-        """Test when unable to fetch latest version."""
-        mock_is_prebuilt.return_value = True
-        mock_get_latest.return_value = None
-        args = Namespace(check=False)
-
-        with pytest.raises(SystemExit) as exc_info:
-            update.run(args)
-
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "Could not check for updates" in captured.out
+        # Nothing was downloaded or launched
+        assert not release_download.new_binary.exists()
+        assert release_download.launches == []
+
+
+UPDATE_RUN_CASES = [
+    pytest.param(
+        False, "99.0.0", False, None, None, 1,
+        ["only available for pre-built binary installations", "pip install --upgrade aicodec"], [],
+        id="not-prebuilt",
+    ),
+    pytest.param(
+        False, "99.0.0", True, None, None, 0,
+        ["A new version is available", "pip install --upgrade aicodec"], ["aicodec update"],
+        id="check-pip-install",
+    ),
+    pytest.param(
+        True, update.__version__, False, None, None, 0, ["already running the latest version"], [],
+        id="already-latest",
+    ),
+    pytest.param(
+        True, "99.0.0", True, None, None, 0, ["A new version is available", "Run 'aicodec update' to install"], [],
+        id="check-only",
+    ),
+    pytest.param(True, "99.0.0", False, "n", None, 0, ["Update cancelled"], [], id="cancelled-by-user"),
+    # A successful update exits so the helper script can replace the binary
+    pytest.param(True, "99.0.0", False, "y", True, 0, ["A new version is available"], [], id="successful-update"),
+    pytest.param(True, "99.0.0", False, "y", False, 1, ["Update failed"], [], id="update-failed"),
+    pytest.param(True, None, False, None, None, 1, ["Could not check for updates"], [], id="cannot-check-updates"),
+]
+
+
+@pytest.mark.parametrize(
+    "prebuilt, latest, check, answer, binary_updated, exit_code, expected, forbidden", UPDATE_RUN_CASES
+)
+def test_update_run(
+    monkeypatch, capsys, prebuilt, latest, check, answer, binary_updated, exit_code, expected, forbidden
+):
+    """Test the exit code and messages of `update.run` for each installation type, release and user answer."""
+    monkeypatch.setattr(update, "is_prebuilt_install", lambda: prebuilt)
+    monkeypatch.setattr(update, "get_latest_version", lambda: latest)  # "99.0.0" is higher than any current version
+    monkeypatch.setattr("builtins.input", lambda _prompt: answer)
+    monkeypatch.setattr(update, "update_binary", lambda: binary_updated)
+
+    with pytest.raises(SystemExit) as exc_info:
+        update.run(Namespace(check=check))
+
+    assert exc_info.value.code == exit_code
+    out = capsys.readouterr().out
+    assert all(needle in out for needle in expected), out
+    assert not any(needle in out for needle in forbidden), out
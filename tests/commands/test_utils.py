@@ -336,6 +336,12 @@ def test_preserves_already_valid_escapes():
         valid_json_string)) == expected_dict
 
 
+def test_valid_json_returned_unchanged():
+    """Tests that valid JSON, even with an escaped backslash before a markdown character, is returned as-is."""
+    valid_json_string = r"""{"summary": "Windows path", "changes": [{"filePath": "a.py", "action": "CREATE", "content": "C:\\_build"}]}"""
+    assert fix_and_parse_ai_json(valid_json_string) == valid_json_string
+
+
 def test_empty_summary_and_content():
     """Tests behavior with empty strings in targeted fields."""
     json_string = """
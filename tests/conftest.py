@@ -1,84 +1,101 @@
 # tests/conftest.py
+import copy
 import json
+import shutil
+from pathlib import Path
 
 import pytest
 
-
-@pytest.fixture
-def sample_project(tmp_path):
-    """Create a sample project structure for testing."""
-    project_dir = tmp_path / "test_project"
-    project_dir.mkdir()
-
-    # Create various file types
-    (project_dir / "main.py").write_text('print("Hello World")')
-    (project_dir / "config.json").write_text('{"key": "value"}')
-    (project_dir / "README.md").write_text("# Test Project\n\nThis is a test.")
-
-    # Create subdirectories
-    src_dir = project_dir / "src"
-    src_dir.mkdir()
-    (src_dir / "utils.py").write_text("def helper(): pass")
-    (src_dir / "module.js").write_text("console.log('test');")
-
-    tests_dir = project_dir / "tests"
-    tests_dir.mkdir()
-    (tests_dir / "test_main.py").write_text("def test_example(): assert True")
-
-    # Create files to exclude
-    node_modules = project_dir / "node_modules" / "submodule"
-    node_modules.mkdir(parents=True, exist_ok=True)
-    (node_modules / "subpackage.js").write_text("// node module")
-    (project_dir / "node_modules" / "package.js").write_text("// package file")
-
-    dist_dir = project_dir / "dist"
-    dist_dir.mkdir()
-    (dist_dir / "bundle.js").write_text("// compiled bundle")
-
-    # Create log files
-    (project_dir / "app.log").write_text("log entry")
-    (project_dir / "error.log").write_text("error entry")
-
-    # Create nested directories for testing
-    ex_dir = project_dir / "ex" / "dir"
-    ex_dir.mkdir(parents=True, exist_ok=True)
-    (ex_dir / "nested.py").write_text("def nested(): pass")
-    (project_dir / "ex" / "dirt.py").write_text("def dirt(): pass")
-
-    # Create .gitignore
-    gitignore_content = """
+SAMPLE_PROJECT_FILES = {
+    # Various file types
+    "main.py": 'print("Hello World")',
+    "config.json": '{"key": "value"}',
+    "README.md": "# Test Project\n\nThis is a test.",
+    # Subdirectories
+    "src/utils.py": "def helper(): pass",
+    "src/module.js": "console.log('test');",
+    "tests/test_main.py": "def test_example(): assert True",
+    # Files to exclude
+    "node_modules/submodule/subpackage.js": "// node module",
+    "node_modules/package.js": "// package file",
+    "dist/bundle.js": "// compiled bundle",
+    # Log files
+    "app.log": "log entry",
+    "error.log": "error entry",
+    # Nested directories
+    "ex/dir/nested.py": "def nested(): pass",
+    "ex/dirt.py": "def dirt(): pass",
+    ".gitignore": """
 node_modules/
 dist/
 *.log
 *.tmp
 decoders/
-"""
-    (project_dir / ".gitignore").write_text(gitignore_content.strip())
-
-    # Create files for plugin testing
-    (project_dir / "data.hdf").write_text("dummy hdf content")
-    (project_dir / "other.dat").write_text("dummy dat content")
-    decoder_dir = project_dir / "decoders"
-    decoder_dir.mkdir()
-    (decoder_dir / "__init__.py").write_text("")
-    (decoder_dir / "hdf_decoder.py").write_text(
-        """
+""".strip(),
+    # Files for plugin testing
+    "data.hdf": "dummy hdf content",
+    "other.dat": "dummy dat content",
+    "decoders/__init__.py": "",
+    "decoders/hdf_decoder.py": """
 import sys
 import json
 if __name__ == "__main__":
     file_path = sys.argv[1]
     print(json.dumps({"status": "decoded", "file": file_path}))
-"""
-    )
-    (decoder_dir / "hdf_decoder_override.py").write_text(
-        """
+""",
+    "decoders/hdf_decoder_override.py": """
 import sys
 if __name__ == "__main__":
     file_path = sys.argv[1]
     print(f"# HDF5 File\\n\\n- Path: {file_path}")
-"""
-    )
+""",
+}
+
+AICODEC_CONFIG = {
+    "aggregate": {
+        "directories": ["."],
+        "use_gitignore": True,
+        "plugins": [
+            ".hdf=python decoders/hdf_decoder.py {file}"
+        ]
+    },
+    "prompt": {
+        "output_file": ".aicodec/prompt.txt",
+        "tech_stack": "Python"
+    },
+    "prepare": {
+        "changes": ".aicodec/changes.json",
+        "from_clipboard": False
+    },
+    "apply": {
+        "output_dir": "."
+    }
+}
+
+
+# Pre-serialized JSON string, built once; fixtures write it as the config file text
+AICODEC_CONFIG_JSON = json.dumps(AICODEC_CONFIG, indent=2)
+
 
+@pytest.fixture(scope="session")
+def _sample_project_template(tmp_path_factory):
+    """Build the sample project tree once per session; tests get their own copy through `sample_project`."""
+    template_dir = tmp_path_factory.mktemp("sample_project_template")
+    for relative_path, content in SAMPLE_PROJECT_FILES.items():
+        file_path = template_dir / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+    return template_dir
+
+
+@pytest.fixture
+def sample_project(_sample_project_template, tmp_path):
+    """Create a sample project structure for testing.
+
+    The tree is copied rather than linked from the session template, so tests may rewrite files in place.
+    """
+    project_dir = tmp_path / "test_project"
+    shutil.copytree(_sample_project_template, project_dir)
     return project_dir
 
 
@@ -87,32 +104,44 @@ def aicodec_config_file(sample_project):
     """Create a basic aicodec configuration file in the sample project."""
     config_dir = sample_project / ".aicodec"
     config_dir.mkdir()
+    config_file = config_dir / "config.json"
+    config_file.write_text(AICODEC_CONFIG_JSON)
+    return config_file
 
-    config_data = {
-        "aggregate": {
-            "directories": ["."],
-            "use_gitignore": True,
-            "plugins": [
-                ".hdf=python decoders/hdf_decoder.py {file}"
-            ]
-        },
-        "prompt": {
-            "output_file": ".aicodec/prompt.txt",
-            "tech_stack": "Python"
-        },
-        "prepare": {
-            "changes": ".aicodec/changes.json",
-            "from_clipboard": False
-        },
-        "apply": {
-            "output_dir": "."
-        }
-    }
 
-    config_file = config_dir / "config.json"
-    config_file.write_text(json.dumps(config_data, indent=2))
+@pytest.fixture
+def aicodec_config_dict():
+    """A fresh copy of the sample aicodec configuration that a test may mutate before writing it."""
+    return copy.deepcopy(AICODEC_CONFIG)
 
-    return config_file
+
+@pytest.fixture
+def fake_sample_project(fs):
+    """Create the sample project, including its config file, on an in-memory pyfakefs filesystem."""
+    project_dir = Path("/test_project")
+    for relative_path, content in SAMPLE_PROJECT_FILES.items():
+        fs.create_file(project_dir / relative_path, contents=content)
+    fs.create_file(project_dir / ".aicodec" / "config.json", contents=AICODEC_CONFIG_JSON)
+    return project_dir
+
+
+@pytest.fixture
+def record_calls(monkeypatch):
+    """Replace a dotted attribute with a plain recording stub.
+
+    Returns a function that installs the stub and hands back the list of `(args, kwargs)` it receives.
+    """
+    def install(target, return_value=True):
+        calls = []
+
+        def stub(*args, **kwargs):
+            calls.append((args, kwargs))
+            return return_value
+
+        monkeypatch.setattr(target, stub)
+        return calls
+
+    return install
 
 
 @pytest.fixture
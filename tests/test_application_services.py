@@ -29,6 +29,7 @@ def temp_config(tmp_path):
 class TestAggregationService:
 
     def test_aggregate_no_files_found(self, mock_file_repo, temp_config, capsys):
+        mock_file_repo.load_hashes.return_value = {}
         mock_file_repo.discover_files.return_value = []
         service = AggregationService(mock_file_repo, temp_config, project_root=temp_config.project_root)
         service.aggregate()
@@ -54,7 +55,7 @@ class TestAggregationService:
         service.aggregate()
         captured = capsys.readouterr()
         assert "No changes detected" in captured.out
-        mock_file_repo.save_hashes.assert_called_once()
+        mock_file_repo.save_hashes.assert_any_call(service.hashes_file, hashes)
 
     def test_aggregate_with_changes(self, mock_file_repo, temp_config, capsys):
         files = [FileItem('a.py', 'new_content'), FileItem('b.py', 'content')]
@@ -75,7 +76,39 @@ class TestAggregationService:
 
         captured = capsys.readouterr()
         assert "Successfully aggregated 2 changed file(s)" in captured.out
-        mock_file_repo.save_hashes.assert_called_once()
+        assert mock_file_repo.save_hashes.call_count == 2
+
+    def test_aggregate_reuses_hash_for_unchanged_signature(self, mock_file_repo, temp_config):
+        files = [FileItem('a.py', None, signature='1:7'), FileItem('b.py', 'content', signature='2:7')]
+        mock_file_repo.discover_files.return_value = files
+        mock_file_repo.load_hashes.side_effect = [
+            {'a.py': 'a_hash', 'gone.py': 'g_hash'},
+            {'': '1000', 'a.py': '1:7', 'gone.py': '3:3'},
+        ]
+
+        service = AggregationService(mock_file_repo, temp_config, project_root=temp_config.project_root)
+        with patch('aicodec.application.services.time.time_ns', return_value=2000):
+            service.aggregate()
+
+        mock_file_repo.discover_files.assert_called_once_with(
+            temp_config, {'a.py': '1:7', 'gone.py': '3:3'}, 1000)
+        with open(service.output_file) as f:
+            data = json.load(f)
+        assert [item['filePath'] for item in data] == ['b.py']
+        saved = dict(call.args for call in mock_file_repo.save_hashes.call_args_list)
+        assert saved[service.hashes_file]['a.py'] == 'a_hash'
+        assert saved[service.signatures_file] == {'': '2000', 'a.py': '1:7', 'b.py': '2:7'}
+
+    @pytest.mark.parametrize('taken_at', [None, 'garbage'])
+    def test_aggregate_trusts_no_signature_without_a_valid_taken_at(self, mock_file_repo, temp_config, taken_at):
+        signatures = {'a.py': '1:7'} if taken_at is None else {'': taken_at, 'a.py': '1:7'}
+        mock_file_repo.discover_files.return_value = []
+        mock_file_repo.load_hashes.side_effect = [{'a.py': 'a_hash'}, signatures]
+
+        service = AggregationService(mock_file_repo, temp_config, project_root=temp_config.project_root)
+        service.aggregate()
+
+        mock_file_repo.discover_files.assert_called_once_with(temp_config, {'a.py': '1:7'}, 0)
 
     def test_aggregate_with_token_count(self, mock_file_repo, temp_config, capsys):
         with patch('aicodec.application.services.tiktoken.get_encoding') as mock_get_encoding:
@@ -1,5 +1,9 @@
 # tests/test_infra_cli.py
 import json
+import os
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -31,6 +35,16 @@ def temp_config_file(tmp_path):
     return config_file
 
 
+def test_cli_import_defers_jsonschema():
+    """Importing the CLI must not pay for jsonschema; it is only needed when validating changes."""
+    code = "import sys, aicodec.infrastructure.cli.command_line_interface; print('jsonschema' in sys.modules)"
+    # Import the package from this checkout, whatever the test process's cwd or installed packages
+    repo_root = Path(__file__).resolve().parents[1]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(repo_root), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert result.stdout.strip() == "False"
+
+
 def test_init_run_interactive(tmp_path, monkeypatch):
     user_inputs = [
         '',    # Directories to scan
@@ -53,7 +67,7 @@ def test_init_run_interactive(tmp_path, monkeypatch):
 
     config_file = tmp_path / '.aicodec' / 'config.json'
     assert config_file.exists()
-    config = json.loads(config_file.read_text())
+    config = json.loads(config_file.read_bytes())
 
     assert config['aggregate']['use_gitignore'] is True
     assert '.gitignore' in config['aggregate']['exclude']
@@ -90,7 +104,7 @@ def test_init_run_interactive_skip_additional(tmp_path, monkeypatch):
 
     config_file = tmp_path / '.aicodec' / 'config.json'
     assert config_file.exists()
-    config = json.loads(config_file.read_text())
+    config = json.loads(config_file.read_bytes())
 
     assert config['aggregate']['include'] == []
     assert config['aggregate']['exclude'] == ['.gitignore']
@@ -158,12 +172,12 @@ def test_prompt_run(temp_config_file, monkeypatch):
     monkeypatch.chdir(temp_config_file.parent.parent)
     with patch('aicodec.infrastructure.cli.commands.prompt.open_file_in_editor'):
         with patch('aicodec.infrastructure.cli.commands.prompt.parse_json_file', side_effect=['[]', '{"schema": true}']) as mock_parse_json:
-            with patch('aicodec.infrastructure.cli.commands.prompt.jinja2') as mock_jinja2:
+            with patch('aicodec.infrastructure.cli.commands.prompt._prompt_template_env') as mock_template_env:
                 mock_template = MagicMock()
                 mock_template.render.return_value = "rendered template"
                 mock_env = MagicMock()
                 mock_env.get_template.return_value = mock_template
-                mock_jinja2.Environment.return_value = mock_env
+                mock_template_env.return_value = mock_env
 
                 context_file = temp_config_file.parent / 'context.json'
                 context_file.write_text('[]')
@@ -193,12 +207,12 @@ def test_prompt_run_to_clipboard(temp_config_file, monkeypatch):
     monkeypatch.chdir(temp_config_file.parent.parent)
     with patch('aicodec.infrastructure.cli.commands.prompt.pyperclip') as mock_pyperclip:
         with patch('aicodec.infrastructure.cli.commands.prompt.parse_json_file', side_effect=['[]', '{"schema": true}']):
-            with patch('aicodec.infrastructure.cli.commands.prompt.jinja2') as mock_jinja2:
+            with patch('aicodec.infrastructure.cli.commands.prompt._prompt_template_env') as mock_template_env:
                 mock_template = MagicMock()
                 mock_template.render.return_value = "rendered template"
                 mock_env = MagicMock()
                 mock_env.get_template.return_value = mock_template
-                mock_jinja2.Environment.return_value = mock_env
+                mock_template_env.return_value = mock_env
 
                 context_file = temp_config_file.parent / 'context.json'
                 context_file.write_text('[]')
@@ -274,19 +288,18 @@ def test_revert_run(temp_config_file, monkeypatch):
 def test_prepare_run_from_clipboard_success(temp_config_file, monkeypatch):
     monkeypatch.chdir(temp_config_file.parent.parent)
     with patch('aicodec.infrastructure.cli.commands.prepare.pyperclip') as mock_pyperclip:
-        with patch('jsonschema.validate'):
-            valid_json_str = '{"summary": "...", "changes": [{"filePath": "a.py", "action": "CREATE", "content": "a"}]}'
-            mock_pyperclip.paste.return_value = valid_json_str
+        valid_json_str = '{"summary": "...", "changes": [{"filePath": "a.py", "action": "CREATE", "content": "a"}]}'
+        mock_pyperclip.paste.return_value = valid_json_str
 
-            args = MagicMock(config=str(temp_config_file),
-                             changes=None, from_clipboard=True)
-            prepare.run(args)
-
-            changes_path = temp_config_file.parent / 'changes.json'
-            # Compare parsed data because prepare command pretty-prints the JSON
-            expected_data = json.loads(valid_json_str)
-            actual_data = json.loads(changes_path.read_text())
-            assert actual_data == expected_data
+        args = MagicMock(config=str(temp_config_file),
+                         changes=None, from_clipboard=True)
+        prepare.run(args)
+
+        changes_path = temp_config_file.parent / 'changes.json'
+        # Compare parsed data because prepare command pretty-prints the JSON
+        expected_data = json.loads(valid_json_str)
+        actual_data = json.loads(changes_path.read_bytes())
+        assert actual_data == expected_data
 
 
 def test_prepare_run_open_editor(temp_config_file, monkeypatch):
@@ -1,5 +1,6 @@
 # tests/test_infra_config_utils.py
 import json
+import logging
 import os
 import subprocess
 from unittest.mock import patch
@@ -7,7 +8,7 @@ from unittest.mock import patch
 import pytest
 
 from aicodec.infrastructure.config import load_config
-from aicodec.infrastructure.utils import open_file_in_editor
+from aicodec.infrastructure.utils import open_file_in_editor, start_logging
 
 
 class TestConfigLoader:
@@ -81,3 +82,19 @@ class TestUtils:
                 captured = capsys.readouterr()
                 assert captured.out == ""
                 assert captured.err == ""
+
+    def test_start_logging_writes_records_to_stderr(self, capsys, caplog):
+        """Tests that records logged under 'aicodec' reach stderr once, and still propagate to caplog."""
+        logger = logging.getLogger("aicodec")
+        listener = start_logging(logging.INFO)
+        try:
+            assert start_logging(logging.INFO) is None
+            logging.getLogger("aicodec.some.module").warning("Could not process file %s", "a.py")
+        finally:
+            listener.stop()
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+            logger.setLevel(logging.NOTSET)
+        captured = capsys.readouterr()
+        assert captured.err.count("WARNING: Could not process file a.py") == 1
+        assert "Could not process file a.py" in caplog.text
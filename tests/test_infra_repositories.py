@@ -1,8 +1,13 @@
 # tests/test_infra_repositories.py
 import json
+import logging
+import os
+import time
+from unittest.mock import patch
 
 import pytest
 
+from aicodec.application.services import AggregationService
 from aicodec.domain.models import AggregateConfig, Change, ChangeAction, ChangeSet
 from aicodec.infrastructure.repositories.file_system_repository import (
     FileSystemChangeSetRepository,
@@ -62,19 +67,95 @@ class TestFileSystemFileRepository:
         relative_files = {item.file_path for item in files}
         assert 'dist/bundle.js' in relative_files
 
-    def test_discover_skip_binary_and_handle_bad_encoding(self, project_structure, file_repo, capsys):
+    def test_discover_skip_binary_and_handle_bad_encoding(self, project_structure, file_repo, caplog):
+        caplog.set_level(logging.INFO)
         config = AggregateConfig(
             directories=[project_structure], use_gitignore=False, project_root=project_structure)
         files = file_repo.discover_files(config)
         relative_files = {item.file_path for item in files}
         assert 'binary.data' not in relative_files
-        captured = capsys.readouterr()
-        assert "Skipping binary file" in captured.out
-        assert "Could not decode bad_encoding.txt as UTF-8" in captured.out
+        assert "Skipping binary file" in caplog.text
+        assert "Could not decode bad_encoding.txt as UTF-8" in caplog.text
         bad_file_content = next(
             f.content for f in files if f.file_path == 'bad_encoding.txt')
         assert '\ufffd' in bad_file_content
 
+    def test_discover_skips_reading_files_with_known_signature(self, project_structure, file_repo):
+        main_py = project_structure / 'main.py'
+        an_hour_ago = time.time_ns() - 3600 * 10**9
+        os.utime(main_py, ns=(an_hour_ago, an_hour_ago))
+        config = AggregateConfig(
+            directories=[project_structure], use_gitignore=True, project_root=project_structure)
+        taken_at = time.time_ns()
+        first = {item.file_path: item for item in file_repo.discover_files(config)}
+        assert first['main.py'].content == 'print("main")'
+        assert first['main.py'].signature is not None
+
+        known = {'main.py': first['main.py'].signature}
+        second = {item.file_path: item for item in file_repo.discover_files(config, known, taken_at)}
+        assert second['main.py'].content is None
+        assert second['Dockerfile'].content == 'FROM python:3.9'
+
+        main_py.write_text('print("changed")')
+        third = {item.file_path: item for item in file_repo.discover_files(config, known, taken_at)}
+        assert third['main.py'].content == 'print("changed")'
+
+    def test_discover_rereads_racily_clean_files(self, project_structure, file_repo):
+        config = AggregateConfig(
+            directories=[project_structure], use_gitignore=True, project_root=project_structure)
+        taken_at = time.time_ns()
+        first = {item.file_path: item for item in file_repo.discover_files(config)}
+
+        # main.py was written just before the signatures were taken, so a matching signature is not enough
+        known = {'main.py': first['main.py'].signature}
+        second = {item.file_path: item for item in file_repo.discover_files(config, known, taken_at)}
+        assert second['main.py'].content == 'print("main")'
+
+    def test_aggregate_sees_same_size_rewrite_with_restored_mtime(self, project_structure, file_repo):
+        main_py = project_structure / 'main.py'
+        an_hour_ago = time.time_ns() - 3600 * 10**9
+        os.utime(main_py, ns=(an_hour_ago, an_hour_ago))
+        config = AggregateConfig(
+            directories=[project_structure], use_gitignore=True, project_root=project_structure)
+        service = AggregationService(file_repo, config, project_root=project_structure)
+        service.aggregate()
+
+        main_py.write_text('print("MAIN")')
+        os.utime(main_py, ns=(an_hour_ago, an_hour_ago))
+        service.aggregate()
+
+        data = json.loads(service.output_file.read_bytes())
+        assert data == [{'filePath': 'main.py', 'content': 'print("MAIN")'}]
+
+    def test_discover_normalizes_newlines(self, project_structure, file_repo):
+        (project_structure / 'windows.txt').write_bytes(b'line1\r\nline2\rline3\n')
+        config = AggregateConfig(
+            directories=[project_structure], use_gitignore=True, project_root=project_structure)
+        files = {item.file_path: item.content for item in file_repo.discover_files(config)}
+        assert files['windows.txt'] == 'line1\nline2\nline3\n'
+
+    def test_discover_ignores_fadvise_failures(self, project_structure, file_repo):
+        config = AggregateConfig(
+            directories=[project_structure], use_gitignore=True, project_root=project_structure)
+        with patch('os.posix_fadvise', side_effect=OSError(29, 'Illegal seek'), create=True):
+            files = {item.file_path: item.content for item in file_repo.discover_files(config)}
+        assert files['main.py'] == 'print("main")'
+
+    def test_discover_skips_unreadable_files(self, project_structure, file_repo, caplog):
+        config = AggregateConfig(
+            directories=[project_structure], use_gitignore=True, project_root=project_structure)
+        read_text_candidate = file_repo._read_text_candidate
+
+        def read_or_deny(path):
+            if path.name == 'main.py':
+                raise PermissionError(13, 'Permission denied')
+            return read_text_candidate(path)
+
+        with patch.object(file_repo, '_read_text_candidate', side_effect=read_or_deny):
+            files = file_repo.discover_files(config)
+        assert 'main.py' not in {item.file_path for item in files}
+        assert "Skipping unreadable file: main.py" in caplog.text
+
     def test_load_and_save_hashes(self, tmp_path, file_repo):
         hashes_file = tmp_path / 'hashes.json'
         assert file_repo.load_hashes(hashes_file) == {}